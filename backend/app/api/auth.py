@@ -10,8 +10,10 @@ from app.core.security import (
     get_current_user
 )
 from app.db.session import get_db
-from app.models.user import User
+from app.models.user import SUPPORTED_LANGUAGES, User, UserRole
 from app.schemas.user import LoginRequest, Token, UserResponse, UserCreate
+from app.services.agent_registry import agent_registry
+from app.services.translator_index import translator_index
 from app.services.email_service import (
     send_verification_email,
     send_welcome_email,
@@ -69,6 +71,14 @@ async def register(
             detail="Email already registered",
         )
 
+    # Agents are routed the calls of their languages
+    for lang in user_data.languages or ():
+        if lang not in SUPPORTED_LANGUAGES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid language: {lang}. Must be one of: {', '.join(SUPPORTED_LANGUAGES)}",
+            )
+
     # Generate email verification token
     verification_token = generate_verification_token()
     token_expiry = get_verification_token_expiry()
@@ -77,6 +87,7 @@ async def register(
         email=user_data.email,
         name=user_data.name,
         role=user_data.role,
+        languages=user_data.languages if user_data.role == UserRole.AGENT else None,
         hashed_password=get_password_hash(user_data.password),
         is_email_verified=False,
         email_verification_token=verification_token,
@@ -85,6 +96,8 @@ async def register(
     db.add(user)
     db.commit()
     db.refresh(user)
+    translator_index.upsert(user)
+    agent_registry.upsert(user)
 
     # Send verification email
     send_verification_email(user.email, user.name, verification_token)
@@ -1,27 +1,147 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import Select, func, insert, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from psycopg2.errors import ExclusionViolation
+from typing import Iterable, List, Optional
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import base64
+import hashlib
+import secrets
 import uuid
 
+from app.core.concurrency import check_if_match, set_etag, version_conflict
 from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.user import User, UserRole
-from app.models.booking import Booking, BookingStatus
-from app.schemas.booking import BookingCreate, BookingUpdate, BookingResponse
+from app.db.session import get_db, SessionLocal
+from app.models.user import User, UserRole, Company
+from app.models.booking import Booking, BookingStatus, ACTIVE_BOOKING_STATUSES
+from app.schemas.booking import (
+    BookingCreate,
+    BookingBulkCreate,
+    BookingSlotResult,
+    TranslatorMatchRequest,
+    TranslatorMatch,
+    BatchBookingRequest,
+    BatchBookingResult,
+    BookingUpdate,
+    BookingResponse,
+    AvailableSlot
+)
+from app.services.availability_service import find_free_slots, to_naive_utc
+from app.services.calendar_cache import calendar_cache
+from app.services.booking_lifecycle import booking_lifecycle
+from app.services.ical_service import generate_calendar
+from app.services.matching_service import find_best_translator
+from app.services.assignment_solver import InterpretationNeed, solve_assignments
+from app.services.translator_index import translator_index
+from app.services.connection_manager import manager
+from app.services.topics import company_topic, translator_topic
+
+MAX_SLOT_SEARCH_DAYS = 31
+MAX_BULK_BOOKINGS = 200
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+FEED_HISTORY_DAYS = 30
+MAX_MATCH_ATTEMPTS = 3
+MAX_BATCH_NEEDS = 1000
+BOOKING_EVENT_CHUNK = 100  # Booking ids per websocket event, within the NOTIFY payload limit
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
-@router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
-async def create_booking(
-    booking_data: BookingCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Create a new booking for translation service"""
+# Load the translator, employee and company names of BookingResponse in the same SELECT
+BOOKING_NAME_OPTIONS = (
+    joinedload(Booking.translator).load_only(User.name),
+    joinedload(Booking.employee).load_only(User.name),
+    joinedload(Booking.company).load_only(Company.name),
+)
+
+def commit_booking_changes(db: Session):
+    """Commit pending booking changes, turning a translator overlap or a concurrent update into a 409"""
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise version_conflict("Booking")
+    except IntegrityError as exc:
+        db.rollback()
+        if isinstance(exc.orig, ExclusionViolation):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Translator already has a booking at this time"
+            )
+        raise
+
+async def publish_booking_event(event_type: str, bookings: Iterable[tuple]):
+    """Notify the translator and company topics of changed (id, translator_id, company_id) bookings"""
+    booking_ids_by_topic = defaultdict(list)
+    for booking_id, translator_id, company_id in bookings:
+        booking_ids_by_topic[translator_topic(translator_id)].append(str(booking_id))
+        booking_ids_by_topic[company_topic(company_id)].append(str(booking_id))
+
+    for topic, booking_ids in booking_ids_by_topic.items():
+        for offset in range(0, len(booking_ids), BOOKING_EVENT_CHUNK):
+            await manager.broadcast(
+                {"type": event_type, "data": {"bookingIds": booking_ids[offset:offset + BOOKING_EVENT_CHUNK]}},
+                topics=[topic]
+            )
+
+def encode_booking_cursor(booking: Booking) -> str:
+    """Encode the (start_time, id) keyset position of a booking as an opaque cursor"""
+    raw = f"{booking.start_time.isoformat()}|{booking.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_booking_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_booking_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        start_time, booking_id = raw.split("|")
+        return datetime.fromisoformat(start_time), uuid.UUID(booking_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def stream_bookings(statement: Select):
+    """Yield bookings from a server-side cursor.
+
+    Runs on its own session because request dependencies are closed
+    before the response body is streamed.
+    """
+    with SessionLocal() as stream_db:
+        yield from stream_db.scalars(
+            statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+def stream_bookings_ndjson(statement: Select):
+    """Yield bookings as NDJSON lines"""
+    for booking in stream_bookings(statement):
+        yield BookingResponse.model_validate(booking).model_dump_json() + "\n"
+
+def filter_bookings_for_user(query, user: User):
+    """Restrict a booking query to the bookings the user may see"""
+    if user.role == UserRole.TRANSLATOR:
+        return query.filter(Booking.translator_id == user.id)
+    elif user.role in [UserRole.EMPLOYEE, UserRole.COMPANY_ADMIN]:
+        if user.role == UserRole.EMPLOYEE:
+            return query.filter(Booking.employee_id == user.id)
+        return query.filter(Booking.company_id == user.company_id)
+    elif user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view bookings"
+        )
+    return query
+
+def validate_booking_request(db: Session, translator_id: uuid.UUID, language: str, duration_minutes: int) -> User:
+    """Check that the translator can be booked for this language and duration"""
     # Verify translator exists and is available
     translator = db.query(User).filter(
-        User.id == booking_data.translator_id,
+        User.id == translator_id,
         User.role == UserRole.TRANSLATOR
     ).first()
 
@@ -38,33 +158,34 @@ async def create_booking(
         )
 
     # Verify language is supported by translator
-    if booking_data.language not in translator.languages:
+    if language not in translator.languages:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Translator does not support {booking_data.language}"
+            detail=f"Translator does not support {language}"
         )
 
     # Verify duration
-    if booking_data.duration_minutes not in [30, 60]:
+    if duration_minutes not in [30, 60]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Duration must be either 30 or 60 minutes"
         )
 
-    # Check for conflicting bookings
-    end_time = booking_data.start_time + timedelta(minutes=booking_data.duration_minutes)
-    conflicting_booking = db.query(Booking).filter(
-        Booking.translator_id == booking_data.translator_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-        Booking.start_time < end_time,
-        Booking.start_time >= booking_data.start_time
-    ).first()
+    return translator
 
-    if conflicting_booking:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Translator already has a booking at this time"
-        )
+@router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_booking(
+    booking_data: BookingCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create a new booking for translation service"""
+    validate_booking_request(
+        db,
+        booking_data.translator_id,
+        booking_data.language,
+        booking_data.duration_minutes
+    )
 
     # Generate Jitsi room name
     jitsi_room = f"translation-{uuid.uuid4().hex[:12]}"
@@ -82,53 +203,533 @@ async def create_booking(
         status=BookingStatus.CONFIRMED
     )
 
+    # Conflicting bookings are rejected by the database on insert
     db.add(booking)
-    db.commit()
+    commit_booking_changes(db)
+    calendar_cache.invalidate(booking.translator_id)
     db.refresh(booking)
+    await publish_booking_event("booking_created", [(booking.id, booking.translator_id, booking.company_id)])
 
     return booking
 
-@router.get("/", response_model=List[BookingResponse])
-async def get_bookings(
-    start_date: datetime = None,
-    end_date: datetime = None,
+@router.post("/bulk", response_model=List[BookingSlotResult], status_code=status.HTTP_201_CREATED)
+async def create_bookings_bulk(
+    bulk_data: BookingBulkCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get bookings for current user (translator or employee)"""
-    query = db.query(Booking)
-
-    # Filter based on user role
-    if current_user.role == UserRole.TRANSLATOR:
-        query = query.filter(Booking.translator_id == current_user.id)
-    elif current_user.role in [UserRole.EMPLOYEE, UserRole.COMPANY_ADMIN]:
-        if current_user.role == UserRole.EMPLOYEE:
-            query = query.filter(Booking.employee_id == current_user.id)
+    """Create many bookings with one translator, from a slot list or a recurrence rule"""
+    if bulk_data.slots:
+        count = len(bulk_data.slots)
+    elif bulk_data.recurrence:
+        count = bulk_data.recurrence.occurrences
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either slots or recurrence must be provided"
+        )
+
+    # Checked before a recurrence is expanded
+    if count > MAX_BULK_BOOKINGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot create more than {MAX_BULK_BOOKINGS} bookings at once"
+        )
+
+    validate_booking_request(
+        db,
+        bulk_data.translator_id,
+        bulk_data.language,
+        bulk_data.duration_minutes
+    )
+
+    length = timedelta(minutes=bulk_data.duration_minutes)
+    try:
+        if bulk_data.slots:
+            start_times = bulk_data.slots
         else:
-            query = query.filter(Booking.company_id == current_user.company_id)
-    elif current_user.role != UserRole.ADMIN:
+            rule = bulk_data.recurrence
+            start_times = [
+                rule.start_time + timedelta(days=rule.interval_days * i)
+                for i in range(rule.occurrences)
+            ]
+        periods = sorted((to_naive_utc(start), to_naive_utc(start) + length) for start in start_times)
+    except OverflowError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Booking times are out of range"
+        )
+
+    # Single set-based probe for every existing booking overlapping any requested slot
+    existing = db.query(Booking.start_time, Booking.duration_minutes).filter(
+        Booking.translator_id == bulk_data.translator_id,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        or_(*[Booking.overlapping(start, end) for start, end in periods])
+    ).all()
+    busy = [(start, start + timedelta(minutes=minutes)) for start, minutes in existing]
+
+    results = []
+    rows = []
+    for start, end in periods:
+        # Reject overlaps with stored bookings and with slots accepted earlier in this request
+        if any(b_start < end and start < b_end for b_start, b_end in busy):
+            results.append(BookingSlotResult(start_time=start, status="conflict"))
+            continue
+
+        booking_id = uuid.uuid4()
+        rows.append({
+            "id": booking_id,
+            "translator_id": bulk_data.translator_id,
+            "employee_id": current_user.id,
+            "company_id": current_user.company_id,
+            "start_time": start,
+            "duration_minutes": bulk_data.duration_minutes,
+            "language": bulk_data.language,
+            "jitsi_room_name": f"translation-{uuid.uuid4().hex[:12]}",
+            "notes": bulk_data.notes,
+            "status": BookingStatus.CONFIRMED
+        })
+        busy.append((start, end))
+        results.append(BookingSlotResult(start_time=start, status="created", booking_id=booking_id))
+
+    if rows:
+        # One multi-row INSERT; a concurrent overlapping booking fails the whole batch with 409
+        db.execute(insert(Booking), rows)
+        commit_booking_changes(db)
+        calendar_cache.invalidate(bulk_data.translator_id)
+        await publish_booking_event(
+            "booking_created",
+            [(row["id"], row["translator_id"], row["company_id"]) for row in rows]
+        )
+
+    return results
+
+@router.post("/match", response_model=TranslatorMatch)
+async def match_translator(
+    match_data: TranslatorMatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Find the best free translator for a language and time slot"""
+    if match_data.duration_minutes not in [30, 60]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duration must be either 30 or 60 minutes"
+        )
+
+    candidate = find_best_translator(
+        db,
+        match_data.language,
+        to_naive_utc(match_data.start_time),
+        match_data.duration_minutes
+    )
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"No {match_data.language} translator is free at this time"
+        )
+
+    return TranslatorMatch(
+        translator_id=candidate.translator.id,
+        translator_name=candidate.translator.name,
+        hourly_rate=candidate.translator.hourly_rate,
+        booked_minutes=candidate.booked_minutes,
+        score=candidate.score
+    )
+
+@router.post("/auto", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_matched_booking(
+    match_data: TranslatorMatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Book the best free translator for a language and time slot"""
+    if match_data.duration_minutes not in [30, 60]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duration must be either 30 or 60 minutes"
+        )
+
+    start_time = to_naive_utc(match_data.start_time)
+    tried = []
+    for _ in range(MAX_MATCH_ATTEMPTS):
+        candidate = find_best_translator(
+            db,
+            match_data.language,
+            start_time,
+            match_data.duration_minutes,
+            exclude=tried
+        )
+        if not candidate:
+            break
+
+        booking = Booking(
+            translator_id=candidate.translator.id,
+            employee_id=current_user.id,
+            company_id=current_user.company_id,
+            start_time=start_time,
+            duration_minutes=match_data.duration_minutes,
+            language=match_data.language,
+            jitsi_room_name=f"translation-{uuid.uuid4().hex[:12]}",
+            notes=match_data.notes,
+            status=BookingStatus.CONFIRMED
+        )
+        db.add(booking)
+        try:
+            commit_booking_changes(db)
+        except HTTPException as exc:
+            if exc.status_code != status.HTTP_409_CONFLICT:
+                raise
+            # Someone else booked this translator meanwhile; try the next best
+            tried.append(candidate.translator.id)
+            calendar_cache.invalidate(candidate.translator.id)
+            continue
+
+        calendar_cache.invalidate(booking.translator_id)
+        db.refresh(booking)
+        await publish_booking_event("booking_created", [(booking.id, booking.translator_id, booking.company_id)])
+        return booking
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"No {match_data.language} translator is free at this time"
+    )
+
+@router.post("/batch", response_model=List[BatchBookingResult], status_code=status.HTTP_201_CREATED)
+async def create_bookings_batch(
+    batch_data: BatchBookingRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Assign translators to many interpretation needs at once (company admin only)
+
+    Assignments are solved together against current availability and all
+    resulting bookings are stored in one transaction.
+    """
+    if current_user.role != UserRole.COMPANY_ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view bookings"
+            detail="Only company admins can submit batch bookings"
+        )
+
+    if not batch_data.needs:
+        return []
+
+    if len(batch_data.needs) > MAX_BATCH_NEEDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot submit more than {MAX_BATCH_NEEDS} needs at once"
+        )
+
+    needs = []
+    for index, need in enumerate(batch_data.needs):
+        if need.duration_minutes not in [30, 60]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duration must be either 30 or 60 minutes"
+            )
+        start_time = to_naive_utc(need.start_time)
+        needs.append(InterpretationNeed(
+            index=index,
+            language=need.language,
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=need.duration_minutes)
+        ))
+
+    candidates_by_language = {
+        language: translator_index.candidates(db, language)
+        for language in {need.language for need in needs}
+    }
+    translator_ids = {
+        info.id for candidates in candidates_by_language.values() for info in candidates
+    }
+    busy = calendar_cache.get_busy(
+        db,
+        translator_ids,
+        min(need.start_time for need in needs),
+        max(need.end_time for need in needs)
+    )
+
+    assignment = solve_assignments(needs, candidates_by_language, busy)
+
+    results = []
+    rows = []
+    for need, need_data in zip(needs, batch_data.needs):
+        translator = assignment.get(need.index)
+        if translator is None:
+            results.append(BatchBookingResult(
+                index=need.index,
+                language=need.language,
+                start_time=need.start_time,
+                status="unfilled"
+            ))
+            continue
+
+        booking_id = uuid.uuid4()
+        rows.append({
+            "id": booking_id,
+            "translator_id": translator.id,
+            "employee_id": current_user.id,
+            "company_id": current_user.company_id,
+            "start_time": need.start_time,
+            "duration_minutes": need_data.duration_minutes,
+            "language": need.language,
+            "jitsi_room_name": f"translation-{uuid.uuid4().hex[:12]}",
+            "notes": need_data.notes,
+            "status": BookingStatus.CONFIRMED
+        })
+        results.append(BatchBookingResult(
+            index=need.index,
+            language=need.language,
+            start_time=need.start_time,
+            status="assigned",
+            booking_id=booking_id,
+            translator_id=translator.id,
+            translator_name=translator.name
+        ))
+
+    if rows:
+        # One transaction; a booking made meanwhile fails the whole batch with 409
+        db.execute(insert(Booking), rows)
+        commit_booking_changes(db)
+        calendar_cache.invalidate(*{row["translator_id"] for row in rows})
+        await publish_booking_event(
+            "booking_created",
+            [(row["id"], row["translator_id"], row["company_id"]) for row in rows]
         )
 
+    return results
+
+@router.get("/", response_model=List[BookingResponse])
+async def get_bookings(
+    response: Response,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get bookings for current user (translator or employee)
+
+    Pages are keyed on (start_time, id): pass the X-Next-Cursor header of one
+    page as ``cursor`` to fetch the next. With ``stream=true`` all matching
+    bookings are streamed as NDJSON instead.
+    """
+    query = db.query(Booking).options(*BOOKING_NAME_OPTIONS)
+
+    query = filter_bookings_for_user(query, current_user)
+
     # Filter by date range
     if start_date:
         query = query.filter(Booking.start_time >= start_date)
     if end_date:
         query = query.filter(Booking.start_time <= end_date)
 
-    bookings = query.order_by(Booking.start_time).all()
+    # Resume after the last booking of the previous page
+    if cursor:
+        query = query.filter(
+            tuple_(Booking.start_time, Booking.id) > tuple_(*decode_booking_cursor(cursor))
+        )
+
+    query = query.order_by(Booking.start_time, Booking.id)
+
+    if stream:
+        return StreamingResponse(
+            stream_bookings_ndjson(query.statement),
+            media_type="application/x-ndjson"
+        )
+
+    if limit is None:
+        return query.all()
+
+    bookings = query.limit(limit + 1).all()
+    if len(bookings) > limit:
+        bookings = bookings[:limit]
+        response.headers["X-Next-Cursor"] = encode_booking_cursor(bookings[-1])
+
     return bookings
 
+@router.post("/feed-token")
+async def rotate_feed_token(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create or rotate the secret token of the current user's iCalendar feed"""
+    current_user.calendar_feed_token = secrets.token_urlsafe(32)
+    db.commit()
+
+    return {
+        "token": current_user.calendar_feed_token,
+        "feed_path": f"/bookings/feed/{current_user.calendar_feed_token}.ics"
+    }
+
+@router.get("/feed/{token}.ics")
+async def get_calendar_feed(
+    token: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Subscribable iCalendar feed of a user's bookings, authenticated by feed token
+
+    Answers 304 when the feed is unchanged since the client's last poll, so
+    most polls cost one aggregate query and never load booking rows.
+    """
+    user = db.query(User).filter(User.calendar_feed_token == token).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar feed not found"
+        )
+
+    # Window start moves once a day so validators stay stable between polls
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    window_start = today - timedelta(days=FEED_HISTORY_DAYS)
+    query = filter_bookings_for_user(db.query(Booking), user).filter(
+        Booking.start_time >= window_start
+    )
+
+    last_updated, booking_count = query.with_entities(
+        func.max(Booking.updated_at),
+        func.count(Booking.id)
+    ).one()
+    last_modified = (last_updated or window_start).replace(microsecond=0, tzinfo=timezone.utc)
+    etag_source = f"{user.id}:{window_start.date()}:{booking_count}:{last_updated}"
+    etag = f'"{hashlib.sha1(etag_source.encode()).hexdigest()}"'
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            if_modified_since = parsedate_to_datetime(request.headers["if-modified-since"])
+            if last_modified <= if_modified_since:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    statement = query.options(*BOOKING_NAME_OPTIONS).order_by(
+        Booking.start_time,
+        Booking.id
+    ).statement
+
+    return StreamingResponse(
+        generate_calendar(stream_bookings(statement), f"{user.name} - Bookings"),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers
+    )
+
+@router.get("/available-slots", response_model=List[AvailableSlot])
+async def get_available_slots(
+    window_start: datetime = Query(..., alias="from"),
+    window_end: datetime = Query(..., alias="to"),
+    duration: int = 60,
+    language: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get free booking slots for every available translator in a time window"""
+    if duration not in [30, 60]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duration must be either 30 or 60 minutes"
+        )
+
+    window_start = to_naive_utc(window_start)
+    window_end = to_naive_utc(window_end)
+    if window_end <= window_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'"
+        )
+    if window_end - window_start > timedelta(days=MAX_SLOT_SEARCH_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search window cannot exceed {MAX_SLOT_SEARCH_DAYS} days"
+        )
+
+    translator_query = db.query(User.id, User.name, User.languages).filter(
+        User.role == UserRole.TRANSLATOR,
+        User.is_available == True
+    )
+    if language:
+        translator_query = translator_query.filter(User.languages.contains([language]))
+    translators = translator_query.order_by(User.name).all()
+
+    if not translators:
+        return []
+
+    # Booked intervals come from the calendar cache; misses are loaded in one query
+    busy_by_translator = calendar_cache.get_busy(
+        db,
+        [t.id for t in translators],
+        window_start,
+        window_end
+    )
+
+    slots = []
+    for translator in translators:
+        available_times = find_free_slots(
+            busy_by_translator.get(translator.id, []),
+            window_start,
+            window_end,
+            duration
+        )
+        if available_times:
+            slots.append(AvailableSlot(
+                translator_id=translator.id,
+                translator_name=translator.name,
+                languages=translator.languages or [],
+                available_times=available_times
+            ))
+
+    return slots
+
+@router.get("/calendar-cache")
+async def get_calendar_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get translator calendar cache hit/miss counters (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view cache statistics"
+        )
+
+    return calendar_cache.stats()
+
+@router.get("/lifecycle")
+async def get_lifecycle_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get background booking lifecycle tick statistics (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view lifecycle statistics"
+        )
+
+    return booking_lifecycle.stats()
+
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get specific booking details"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).options(*BOOKING_NAME_OPTIONS).filter(
+        Booking.id == booking_id
+    ).first()
 
     if not booking:
         raise HTTPException(
@@ -150,12 +751,15 @@ async def get_booking(
             detail="Not authorized to view this booking"
         )
 
+    set_etag(response, booking.version)
     return booking
 
 @router.put("/{booking_id}", response_model=BookingResponse)
 async def update_booking(
     booking_id: str,
     update_data: BookingUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -181,20 +785,26 @@ async def update_booking(
             detail="Not authorized to update this booking"
         )
 
+    check_if_match(if_match, booking.version, "Booking")
+
     # Update fields
     if update_data.status:
         booking.status = update_data.status
     if update_data.notes is not None:
         booking.notes = update_data.notes
 
-    db.commit()
+    commit_booking_changes(db)
+    calendar_cache.invalidate(booking.translator_id)
     db.refresh(booking)
+    await publish_booking_event("booking_updated", [(booking.id, booking.translator_id, booking.company_id)])
 
+    set_etag(response, booking.version)
     return booking
 
 @router.delete("/{booking_id}")
 async def cancel_booking(
     booking_id: str,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -219,7 +829,10 @@ async def cancel_booking(
             detail="Not authorized to cancel this booking"
         )
 
+    check_if_match(if_match, booking.version, "Booking")
     booking.status = BookingStatus.CANCELLED
-    db.commit()
+    commit_booking_changes(db)
+    calendar_cache.invalidate(booking.translator_id)
+    await publish_booking_event("booking_cancelled", [(booking.id, booking.translator_id, booking.company_id)])
 
     return {"message": "Booking cancelled successfully"}
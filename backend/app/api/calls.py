@@ -1,17 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
 from app.db.session import get_db
+from app.core.concurrency import check_if_match, set_etag, version_conflict
 from app.core.security import get_current_user
-from app.models.user import User
+from app.models.user import SUPPORTED_LANGUAGES, User
 from app.models.call import Call, CallStatus
 from app.schemas.call import CallCreate, CallResponse, CallUpdate
+from app.services.call_dispatcher import call_dispatcher
+from app.services.call_metrics import call_metrics
+from app.services.queue_manager import QueueManager
 
 router = APIRouter(prefix="/calls", tags=["calls"])
 
+def commit_call_changes(db: Session, call: Call, previous_agent_id: Optional[UUID] = None):
+    """Commit a call change, turning a concurrent update of the call into a 409"""
+    try:
+        QueueManager(db).commit_call_transition(call, previous_agent_id)
+    except StaleDataError:
+        db.rollback()
+        raise version_conflict("Call")
+
 @router.get("/active", response_model=List[CallResponse])
 async def get_active_calls(
     db: Session = Depends(get_db),
@@ -25,23 +38,40 @@ async def get_active_calls(
 @router.post("/start", response_model=CallResponse)
 async def start_call(
     call_data: CallCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # A call in any other language would wait in a pool no agent serves
+    if call_data.language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid language: {call_data.language}. Must be one of: {', '.join(SUPPORTED_LANGUAGES)}",
+        )
+
     call = Call(
         room_name=call_data.room_name,
         customer_name=call_data.customer_name,
         customer_phone=call_data.customer_phone,
+        language=call_data.language,
         status=CallStatus.WAITING,
     )
     db.add(call)
-    db.commit()
+    db.flush()
+
+    # Insert the call and its queue entry in one transaction, then wake the dispatcher
+    QueueManager(db).add_to_queue(call.id, call.language)
+    call_metrics.record_transition(None, CallStatus.WAITING)
     db.refresh(call)
+    call_dispatcher.notify(call.id)
+    set_etag(response, call.version)
     return call
 
 @router.post("/end", response_model=CallResponse)
 async def end_call(
     call_id: UUID,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -52,6 +82,7 @@ async def end_call(
             detail="Call not found"
         )
 
+    check_if_match(if_match, call.version, "Call")
     if call.status == CallStatus.ENDED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -65,14 +96,21 @@ async def end_call(
         duration = (call.end_time - call.start_time).total_seconds()
         call.duration = int(duration)
 
-    db.commit()
+    # Frees the agent in the same transaction
+    commit_call_changes(db, call)
     db.refresh(call)
+
+    # The agent is free again
+    call_dispatcher.notify()
+    set_etag(response, call.version)
     return call
 
 @router.put("/{call_id}", response_model=CallResponse)
 async def update_call(
     call_id: UUID,
     call_update: CallUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -83,11 +121,18 @@ async def update_call(
             detail="Call not found"
         )
 
+    check_if_match(if_match, call.version, "Call")
+    previous_agent_id = call.agent_id
     for field, value in call_update.dict(exclude_unset=True).items():
         setattr(call, field, value)
 
-    db.commit()
+    # Agent states follow the call status and assignment
+    commit_call_changes(db, call, previous_agent_id)
     db.refresh(call)
+
+    # A status change may free an agent
+    call_dispatcher.notify()
+    set_etag(response, call.version)
     return call
 
 @router.get("/history", response_model=List[CallResponse])
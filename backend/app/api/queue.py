@@ -1,76 +1,313 @@
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from datetime import datetime, timezone
+from typing import Optional
 import json
+from uuid import UUID
 
-from app.db.session import get_db
-from app.core.security import get_current_user
-from app.models.user import User
-from app.models.call import Call, CallStatus
+from app.db.session import get_db, SessionLocal
+from app.core.security import authenticate_token, get_current_user
+from app.models.user import SUPPORTED_LANGUAGES, AgentState, User, UserRole
 from app.models.queue import QueueItem
+from app.schemas.user import AgentLanguagesUpdate
+from app.services.agent_registry import agent_registry
+from app.services.call_dispatcher import call_dispatcher
+from app.services.call_metrics import call_metrics
+from app.services.metrics_history import metrics_history
+from app.services.metrics_publisher import metrics_publisher
+from app.services.queue_manager import QueueManager
+from app.services.connection_manager import manager
+from app.services.topics import METRICS_TOPIC, can_subscribe, default_topics
+from app.services.wait_estimator import wait_estimator
 
 router = APIRouter(prefix="/queue", tags=["queue"])
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+@router.get("")
+async def get_queue(
+    language: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    query = db.query(QueueItem)
+    if language:
+        query = query.filter(QueueItem.language == language)
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    queue_items = query.order_by(
+        QueueItem.priority.desc(),
+        QueueItem.sequence
+    ).all()
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+    # Positions are derived from the order instead of being stored
+    return [
+        {
+            "id": item.id,
+            "call_id": item.call_id,
+            "language": item.language,
+            "position": position,
+            "priority": item.priority,
+            "created_at": item.created_at,
+        }
+        for position, item in enumerate(queue_items, start=1)
+    ]
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                pass
+@router.get("/position/{call_id}")
+async def get_queue_position(
+    call_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """Position within the caller's language pool and estimated wait"""
+    estimate = wait_estimator.estimate(call_id)
+    if estimate is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Call is not waiting in the queue"
+        )
 
-manager = ConnectionManager()
+    return estimate
 
-@router.get("")
-async def get_queue(
+@router.get("/estimator")
+async def get_estimator_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Decayed wait and handle times per priority and language"""
+    return wait_estimator.stats()
+
+@router.post("/assign")
+async def assign_waiting_calls(
+    batched: bool = True,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    queue_items = db.query(QueueItem).order_by(
-        QueueItem.priority.desc(),
-        QueueItem.created_at
-    ).all()
-    return queue_items
+    """Run one assignment round pairing waiting calls with available agents"""
+    assignment_round = QueueManager(db).auto_assign_calls(batched=batched)
+
+    return {
+        "assignments": [
+            {"call_id": call_id, "agent_id": agent_id}
+            for call_id, agent_id in assignment_round.assignments
+        ],
+        "latencyMs": assignment_round.latency_ms
+    }
+
+@router.get("/agents")
+async def get_agent_occupancy(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Agent counts per state and idle agents per skill"""
+    agent_registry.ensure_loaded(db)
+    return agent_registry.stats()
+
+@router.put("/agents/{agent_id}/languages")
+async def set_agent_languages(
+    agent_id: UUID,
+    update_data: AgentLanguagesUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Set the languages an agent is routed calls for (the agent, a supervisor or an admin)"""
+    if current_user.id != agent_id and current_user.role not in (UserRole.SUPERVISOR, UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this agent"
+        )
+
+    for lang in update_data.languages:
+        if lang not in SUPPORTED_LANGUAGES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid language: {lang}. Must be one of: {', '.join(SUPPORTED_LANGUAGES)}",
+            )
+
+    agent = db.query(User).filter(User.id == agent_id, User.role == UserRole.AGENT).first()
+    if not agent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found"
+        )
+
+    agent.languages = list(dict.fromkeys(update_data.languages))
+    db.commit()
+    db.refresh(agent)
+    agent_registry.upsert(agent)
+
+    # The agent may now serve calls that were waiting
+    call_dispatcher.notify()
+    return {"agent_id": agent.id, "languages": agent.languages}
+
+@router.put("/agents/me/state")
+async def set_own_agent_state(
+    state: AgentState,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Go online (IDLE) or OFFLINE; ringing and busy follow the calls"""
+    if current_user.role != UserRole.AGENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only agents have an occupancy state"
+        )
+
+    if state not in (AgentState.IDLE, AgentState.OFFLINE):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Agents can only switch between IDLE and OFFLINE"
+        )
+
+    if current_user.agent_state in (AgentState.RINGING, AgentState.BUSY):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Agent is on a call"
+        )
+
+    # Conditional on the stored state, so a call ringing the agent meanwhile is not overwritten
+    if not QueueManager(db).update_agent_state(current_user.id, state):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Agent is on a call"
+        )
+    if state == AgentState.IDLE:
+        call_dispatcher.notify()
+
+    return {"agent_id": current_user.id, "state": state}
+
+@router.get("/connections")
+async def get_connection_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Websocket clients, evictions and fan-out latency"""
+    return manager.stats()
+
+@router.get("/dispatcher")
+async def get_dispatcher_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Dispatcher rounds and start-to-ringing latency"""
+    return call_dispatcher.stats()
 
 @router.get("/metrics")
 async def get_metrics(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    total_calls = db.query(Call).count()
-    active_calls = db.query(Call).filter(Call.status == CallStatus.ACTIVE).count()
-    waiting_calls = db.query(Call).filter(Call.status == CallStatus.WAITING).count()
+    """Call center metrics from incrementally maintained counters"""
+    return call_metrics.snapshot(db)
 
-    avg_duration = db.query(func.avg(Call.duration)).filter(
-        Call.duration.isnot(None)
-    ).scalar() or 0
+@router.get("/metrics/push")
+async def get_metrics_push_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Websocket metrics push ticks and subscribers"""
+    return metrics_publisher.stats()
+
+@router.get("/metrics/counters")
+async def get_metrics_counters(
+    current_user: User = Depends(get_current_user)
+):
+    """Raw counters and the drift found by the last reconcile"""
+    return call_metrics.stats()
+
+@router.get("/history")
+async def get_metrics_history(
+    resolution: str = "minute",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue depth, throughput and wait time series for charts"""
+    series = metrics_history.series.get(resolution)
+    if series is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"resolution must be one of {', '.join(metrics_history.series)}"
+        )
+
+    def to_epoch(value: datetime) -> float:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+    now = datetime.now(timezone.utc).timestamp()
+    end_at = min(to_epoch(end), now) if end else now
+    start_at = to_epoch(start) if start else end_at - series.retention_seconds()
+    if start_at > end_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
 
     return {
-        "totalCalls": total_calls,
-        "activeCalls": active_calls,
-        "waitingCalls": waiting_calls,
-        "averageWaitTime": 0,
-        "averageCallDuration": int(avg_duration)
+        "resolution": resolution,
+        "stepSeconds": series.resolution_seconds,
+        "points": metrics_history.query(resolution, start_at, end_at),
     }
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
+    """Authenticated event stream; clients subscribe to topics they may read
+
+    Connect with ?token=<JWT>. Messages are JSON {"type", "data"}; send
+    {"type": "subscribe" | "unsubscribe", "data": {"topics": [...]}} to change
+    subscriptions, e.g. "queue", "agent:<id>", "company:<id>" or
+    "translator:<id>", and {"type": "position", "data": {"callId"}} for a
+    waiting call's position and ETA. Subscribers of "metrics" receive
+    metrics_delta messages and send {"type": "metrics_snapshot"} for the
+    full state, e.g. after reconnecting or on a sequence gap.
+    """
+    user = None
+    if token:
+        with SessionLocal() as db:
+            try:
+                user = authenticate_token(token, db)
+            except HTTPException:
+                user = None
+
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await manager.connect(websocket, default_topics(user))
+    manager.send(websocket, {"type": "subscribed", "data": {"topics": sorted(manager.topics(websocket))}})
     try:
         while True:
-            data = await websocket.receive_text()
-            # Echo back for now, can add more logic later
-            await websocket.send_text(f"Message received: {data}")
+            try:
+                message = json.loads(await websocket.receive_text())
+                message_type = message["type"]
+                data = message.get("data") or {}
+            except (ValueError, KeyError, TypeError):
+                manager.send(websocket, {"type": "error", "data": {"detail": "Expected JSON {type, data}"}})
+                continue
+
+            if message_type in ("subscribe", "unsubscribe"):
+                topics = [topic for topic in data.get("topics", []) if isinstance(topic, str)]
+                if message_type == "subscribe":
+                    denied = [topic for topic in topics if not can_subscribe(user, topic)]
+                    manager.subscribe(websocket, [topic for topic in topics if topic not in denied])
+                    if denied:
+                        manager.send(websocket, {"type": "error", "data": {"detail": "Not authorized", "topics": denied}})
+                else:
+                    manager.unsubscribe(websocket, topics)
+                manager.send(websocket, {"type": "subscribed", "data": {"topics": sorted(manager.topics(websocket))}})
+            elif message_type == "position":
+                try:
+                    estimate = wait_estimator.estimate(UUID(str(data.get("callId"))))
+                except ValueError:
+                    estimate = None
+                if estimate is None:
+                    manager.send(websocket, {"type": "error", "data": {"detail": "Call is not waiting in the queue"}})
+                else:
+                    manager.send(websocket, {"type": "position", "data": jsonable_encoder(estimate)})
+            elif message_type == "metrics_snapshot":
+                if METRICS_TOPIC in manager.topics(websocket):
+                    manager.send(websocket, metrics_publisher.snapshot_message())
+                else:
+                    manager.send(websocket, {"type": "error", "data": {"detail": "Subscribe to metrics first"}})
+            elif message_type == "ping":
+                manager.send(websocket, {"type": "pong", "data": {}})
+            else:
+                manager.send(websocket, {"type": "error", "data": {"detail": f"Unknown message type {message_type}"}})
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
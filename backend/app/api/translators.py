@@ -4,13 +4,14 @@ from typing import List
 
 from app.core.security import get_password_hash, get_current_user
 from app.db.session import get_db
-from app.models.user import User, UserRole
+from app.models.user import SUPPORTED_LANGUAGES, User, UserRole
 from app.schemas.translator import (
     TranslatorRegister,
     TranslatorResponse,
     TranslatorAvailability,
     TranslatorUpdate
 )
+from app.services.translator_index import translator_index
 from app.services.email_service import (
     send_verification_email,
     generate_verification_token,
@@ -34,7 +35,7 @@ async def register_translator(
         )
 
     # Validate languages
-    valid_languages = ["SPANISH", "FRENCH", "GERMAN"]
+    valid_languages = SUPPORTED_LANGUAGES
     for lang in translator_data.languages:
         if lang not in valid_languages:
             raise HTTPException(
@@ -63,6 +64,7 @@ async def register_translator(
     db.add(translator)
     db.commit()
     db.refresh(translator)
+    translator_index.upsert(translator)
 
     # Send verification email
     send_verification_email(translator.email, translator.name, verification_token)
@@ -76,17 +78,8 @@ async def get_translators(
     db: Session = Depends(get_db)
 ):
     """Get list of translators, optionally filtered by language and availability"""
-    query = db.query(User).filter(User.role == UserRole.TRANSLATOR)
-
-    if available_only:
-        query = query.filter(User.is_available == True)
-
-    if language:
-        # Filter translators who have this language
-        query = query.filter(User.languages.contains([language]))
-
-    translators = query.all()
-    return translators
+    # Served from the in-process language index; the users table is only read on reload
+    return translator_index.candidates(db, language or None, available_only=available_only)
 
 @router.get("/{translator_id}", response_model=TranslatorResponse)
 async def get_translator(
@@ -136,6 +129,7 @@ async def update_availability(
     translator.is_available = availability.is_available
     db.commit()
     db.refresh(translator)
+    translator_index.upsert(translator)
 
     return translator
 
@@ -177,5 +171,6 @@ async def update_translator(
 
     db.commit()
     db.refresh(translator)
+    translator_index.upsert(translator)
 
     return translator
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+
+def version_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int):
+    response.headers["ETag"] = version_etag(version)
+
+
+def check_if_match(if_match: Optional[str], version: int, resource: str):
+    """Reject the write with a 409 unless If-Match names the current version"""
+    if not if_match:
+        return
+    tags = [tag.strip().removeprefix("W/") for tag in if_match.split(",")]
+    if "*" in tags or version_etag(version) in tags:
+        return
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"{resource} was modified by another request",
+        headers={"ETag": version_etag(version)}
+    )
+
+
+def version_conflict(resource: str) -> HTTPException:
+    """409 for an update whose conditional UPDATE matched no row"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"{resource} was modified by another request"
+    )
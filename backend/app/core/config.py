@@ -17,6 +17,47 @@ class Settings(BaseSettings):
     SMTP_FROM_EMAIL: str = "noreply@translationplatform.com"
     FRONTEND_URL: str = "http://localhost:3000"
 
+    # Translator calendar cache
+    CALENDAR_CACHE_SIZE: int = 5000  # Translators kept in memory
+    CALENDAR_CACHE_TTL_SECONDS: int = 60
+    CALENDAR_CACHE_HORIZON_DAYS: int = 7
+
+    # Translator language index and automatic matching
+    TRANSLATOR_INDEX_TTL_SECONDS: int = 300
+    MATCH_LOAD_WEIGHT: float = 10.0  # Score per hour already booked that day
+    MATCH_RATE_WEIGHT: float = 1.0  # Score per unit of hourly rate
+
+    # Background booking lifecycle (CONFIRMED -> IN_PROGRESS -> COMPLETED)
+    BOOKING_LIFECYCLE_ENABLED: bool = True
+    BOOKING_LIFECYCLE_INTERVAL_SECONDS: int = 30
+    BOOKING_LIFECYCLE_BATCH_SIZE: int = 500
+
+    # Call center agent occupancy index
+    AGENT_REGISTRY_TTL_SECONDS: int = 30
+
+    # Websocket fan-out
+    WS_SEND_QUEUE_SIZE: int = 100  # Pending messages per client before it is evicted as slow
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0
+    EVENT_BUS_BACKEND: str = "memory"  # "memory" (single worker) or "postgres" (LISTEN/NOTIFY)
+    EVENT_BUS_CHANNEL: str = "platform_events"
+
+    # Queue position and wait time estimates
+    ESTIMATOR_HALF_LIFE_SECONDS: int = 900  # Weight of an observation halves after this long
+
+    # Call center metrics
+    METRICS_MAX_STALENESS_SECONDS: float = 2.0  # Age limit of the served snapshot
+    METRICS_RECONCILE_INTERVAL_SECONDS: int = 60  # Full aggregate over calls
+    METRICS_PUSH_INTERVAL_SECONDS: float = 2.0  # Delta push to websocket dashboards
+
+    # Queue metrics history ring buffers (slots per resolution)
+    HISTORY_SECOND_SLOTS: int = 3600  # 1 hour of per-second samples
+    HISTORY_MINUTE_SLOTS: int = 1440  # 1 day of per-minute samples
+    HISTORY_HOUR_SLOTS: int = 720  # 30 days of hourly samples
+
+    # Call dispatcher
+    DISPATCHER_FALLBACK_INTERVAL_SECONDS: float = 5.0  # Wake-up when no event arrives
+    QUEUE_RESYNC_INTERVAL_SECONDS: float = 10.0  # Re-sync the in-memory queue with the queue table
+
     class Config:
         env_file = ".env"
 
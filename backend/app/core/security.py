@@ -39,10 +39,8 @@ def decode_token(token: str) -> dict:
             detail="Could not validate credentials",
         )
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+def authenticate_token(token: str, db: Session) -> User:
+    """Resolve a bearer token to its user, raising 401 when it is not valid"""
     payload = decode_token(token)
     user_id: str = payload.get("sub")
     if user_id is None:
@@ -58,3 +56,9 @@ async def get_current_user(
             detail="User not found",
         )
     return user
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    return authenticate_token(token, db)
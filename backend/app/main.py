@@ -1,16 +1,49 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import auth, calls, queue, translators, bookings, companies
-from app.db.session import engine, Base
+from app.core.config import settings
+from app.db.session import engine, Base, SessionLocal
+from app.services.agent_registry import agent_registry
+from app.services.booking_lifecycle import booking_lifecycle
+from app.services.call_dispatcher import call_dispatcher
+from app.services.call_metrics import call_metrics
+from app.services.metrics_publisher import metrics_publisher
+from app.services.connection_manager import manager
+from app.services.queue_engine import queue_engine
+from app.services.wait_estimator import wait_estimator
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rebuild the in-memory call queue and agent occupancy index
+    with SessionLocal() as db:
+        queue_engine.rebuild(db)
+        agent_registry.load(db)
+        wait_estimator.rebuild(db)
+
+    # Start the websocket event bus and background tasks
+    await manager.start()
+    if settings.BOOKING_LIFECYCLE_ENABLED:
+        booking_lifecycle.start()
+    call_dispatcher.start()
+    call_metrics.start()
+    metrics_publisher.start()
+    yield
+    await metrics_publisher.stop()
+    await call_metrics.stop()
+    await call_dispatcher.stop()
+    await booking_lifecycle.stop()
+    await manager.stop()
+
 app = FastAPI(
     title="Translation Platform API",
     description="API for translation booking and call center management",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware - Allow both domain and IP-based access
@@ -27,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Enum as SQLEnum, DateTime, Integer, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Enum as SQLEnum, DateTime, Integer, ForeignKey, Text, Index, Interval, DDL, event, func, literal_column, text
+from sqlalchemy.dialects.postgresql import UUID, TSRANGE, ExcludeConstraint
 from sqlalchemy.orm import relationship
 import uuid
 import enum
@@ -18,6 +18,17 @@ class BookingDuration(str, enum.Enum):
     THIRTY_MINUTES = "30"
     ONE_HOUR = "60"
 
+# Statuses that occupy the translator's time slot
+ACTIVE_BOOKING_STATUSES = [BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.IN_PROGRESS]
+
+def booking_end_time(start_time, duration_minutes):
+    """start_time + duration_minutes as a SQL expression"""
+    return start_time + duration_minutes * literal_column("interval '1 minute'", Interval)
+
+def booking_period(start_time, duration_minutes):
+    """Half-open tsrange [start_time, start_time + duration_minutes) as a SQL expression"""
+    return func.tsrange(start_time, booking_end_time(start_time, duration_minutes), type_=TSRANGE)
+
 class Booking(Base):
     __tablename__ = "bookings"
 
@@ -40,6 +51,9 @@ class Booking(Base):
     jitsi_room_name = Column(String, nullable=True)
     notes = Column(Text, nullable=True)
 
+    # Bumped by every update; ORM updates are conditional on the version that was read
+    version = Column(Integer, nullable=False, default=1)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -48,3 +62,51 @@ class Booking(Base):
     translator = relationship("User", foreign_keys=[translator_id], back_populates="translator_bookings")
     employee = relationship("User", foreign_keys=[employee_id], back_populates="employee_bookings")
     company = relationship("Company")
+
+    __table_args__ = (
+        # A translator can never hold two active bookings with overlapping periods.
+        # The backing GiST index also serves the range-overlap conflict lookups.
+        ExcludeConstraint(
+            (translator_id, "="),
+            (booking_period(start_time, duration_minutes), "&&"),
+            name="excl_bookings_translator_period",
+            using="gist",
+            where=text("status IN ('PENDING', 'CONFIRMED', 'IN_PROGRESS')"),
+        ),
+        # Keyset pagination order for booking listings
+        Index("idx_bookings_start_time_id", start_time, id),
+        # Bookings still waiting for the lifecycle engine to move them
+        Index(
+            "idx_bookings_lifecycle_due",
+            start_time,
+            postgresql_where=text("status IN ('CONFIRMED', 'IN_PROGRESS')"),
+        ),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+
+    @property
+    def translator_name(self):
+        return self.translator.name if self.translator else None
+
+    @property
+    def employee_name(self):
+        return self.employee.name if self.employee else None
+
+    @property
+    def company_name(self):
+        return self.company.name if self.company else None
+
+    @classmethod
+    def overlapping(cls, start_time, end_time):
+        """Filter clause matching bookings whose period overlaps [start_time, end_time)"""
+        return booking_period(cls.start_time, cls.duration_minutes).op("&&")(
+            func.tsrange(start_time, end_time, type_=TSRANGE)
+        )
+
+# btree_gist provides the "=" operator class for UUIDs inside the GiST exclusion constraint
+event.listen(
+    Booking.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
@@ -20,9 +20,14 @@ class Call(Base):
     room_name = Column(String, unique=True, nullable=False)
     customer_name = Column(String, nullable=True)
     customer_phone = Column(String, nullable=True)
+    language = Column(String, nullable=False)  # Routes the call to agents with this skill
     agent_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     status = Column(SQLEnum(CallStatus), nullable=False, default=CallStatus.WAITING)
     start_time = Column(DateTime, nullable=True)
     end_time = Column(DateTime, nullable=True)
     duration = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, default=1)  # Bumped by every update
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # ORM updates become UPDATE ... WHERE id = ? AND version = ?; losing a race raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
@@ -1,15 +1,30 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Index, Sequence
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 
 from app.db.session import Base
 
+# Enqueue order; assigned by the database so concurrent inserts never collide
+queue_sequence = Sequence("queue_sequence_seq")
+
 class QueueItem(Base):
     __tablename__ = "queue"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    call_id = Column(UUID(as_uuid=True), ForeignKey("calls.id"), nullable=False)
-    position = Column(Integer, nullable=False)
-    priority = Column(Integer, default=0)
+    call_id = Column(UUID(as_uuid=True), ForeignKey("calls.id"), nullable=False, unique=True)
+    language = Column(String, nullable=False)  # Copied from the call; one routing pool per language
+    priority = Column(Integer, nullable=False, default=0)
+    sequence = Column(
+        BigInteger,
+        queue_sequence,
+        server_default=queue_sequence.next_value(),
+        nullable=False
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Dequeue order; positions are derived from it on read
+        Index("idx_queue_order", priority.desc(), sequence),
+        Index("idx_queue_language_order", language, priority.desc(), sequence),
+    )
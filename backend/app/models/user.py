@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Enum as SQLEnum, Boolean, ForeignKey, Table, Text, DateTime
+from sqlalchemy import Column, String, Enum as SQLEnum, Boolean, ForeignKey, Table, Text, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 import uuid
@@ -12,12 +12,24 @@ class UserRole(str, enum.Enum):
     EMPLOYEE = "EMPLOYEE"
     COMPANY_ADMIN = "COMPANY_ADMIN"
     ADMIN = "ADMIN"
+    # Call center roles
+    AGENT = "AGENT"
+    SUPERVISOR = "SUPERVISOR"
+
+class AgentState(str, enum.Enum):
+    IDLE = "IDLE"
+    RINGING = "RINGING"
+    BUSY = "BUSY"
+    OFFLINE = "OFFLINE"
 
 class Language(str, enum.Enum):
     SPANISH = "SPANISH"
     FRENCH = "FRENCH"
     GERMAN = "GERMAN"
 
+# Languages translators offer and calls are routed by; an agent's languages are its skills
+SUPPORTED_LANGUAGES = [language.value for language in Language]
+
 # Association table for translator languages
 translator_languages = Table(
     'translator_languages',
@@ -48,11 +60,37 @@ class User(Base):
     email_verification_token = Column(String, nullable=True)
     email_verification_token_expires = Column(DateTime, nullable=True)
 
+    # Call center agent occupancy, maintained on call transitions
+    agent_state = Column(SQLEnum(AgentState), nullable=False, default=AgentState.OFFLINE, server_default=AgentState.OFFLINE.value)
+
+    # Secret token for the subscribable iCalendar booking feed
+    calendar_feed_token = Column(String, unique=True, index=True, nullable=True)
+
     # Relationships
     company = relationship("Company", back_populates="employees")
     translator_bookings = relationship("Booking", foreign_keys="[Booking.translator_id]", back_populates="translator")
     employee_bookings = relationship("Booking", foreign_keys="[Booking.employee_id]", back_populates="employee")
 
+    __table_args__ = (
+        # Language search over translators only, independent of other user counts
+        Index(
+            "idx_users_translator_languages",
+            languages,
+            postgresql_using="gin",
+            postgresql_where=text("role = 'TRANSLATOR'"),
+        ),
+        Index(
+            "idx_users_translator_available",
+            is_available,
+            postgresql_where=text("role = 'TRANSLATOR'"),
+        ),
+        Index(
+            "idx_users_agent_state",
+            agent_state,
+            postgresql_where=text("role = 'AGENT'"),
+        ),
+    )
+
 class Company(Base):
     __tablename__ = "companies"
 
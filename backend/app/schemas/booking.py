@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -10,6 +10,57 @@ class BookingCreate(BaseModel):
     language: str
     notes: Optional[str] = None
 
+class BookingRecurrence(BaseModel):
+    start_time: datetime
+    interval_days: int = Field(7, ge=1, le=366)  # Weekly by default
+    occurrences: int = Field(ge=1)
+
+class BookingBulkCreate(BaseModel):
+    translator_id: UUID
+    duration_minutes: int  # 30 or 60
+    language: str
+    notes: Optional[str] = None
+
+    # Either an explicit list of start times or a recurrence rule
+    slots: Optional[List[datetime]] = None
+    recurrence: Optional[BookingRecurrence] = None
+
+class BookingSlotResult(BaseModel):
+    start_time: datetime
+    status: str  # "created" or "conflict"
+    booking_id: Optional[UUID] = None
+
+class TranslatorMatchRequest(BaseModel):
+    language: str
+    start_time: datetime
+    duration_minutes: int  # 30 or 60
+    notes: Optional[str] = None
+
+class TranslatorMatch(BaseModel):
+    translator_id: UUID
+    translator_name: str
+    hourly_rate: Optional[str] = None
+    booked_minutes: int  # Already booked on the requested day
+    score: float
+
+class BatchBookingNeed(BaseModel):
+    language: str
+    start_time: datetime
+    duration_minutes: int  # 30 or 60
+    notes: Optional[str] = None
+
+class BatchBookingRequest(BaseModel):
+    needs: List[BatchBookingNeed]
+
+class BatchBookingResult(BaseModel):
+    index: int  # Position of the need in the request
+    language: str
+    start_time: datetime
+    status: str  # "assigned" or "unfilled"
+    booking_id: Optional[UUID] = None
+    translator_id: Optional[UUID] = None
+    translator_name: Optional[str] = None
+
 class BookingUpdate(BaseModel):
     status: Optional[str] = None
     notes: Optional[str] = None
@@ -25,6 +76,7 @@ class BookingResponse(BaseModel):
     status: str
     jitsi_room_name: Optional[str]
     notes: Optional[str]
+    version: int
     created_at: datetime
 
     # Nested user info
@@ -8,6 +8,7 @@ class CallBase(BaseModel):
     room_name: str
     customer_name: Optional[str] = None
     customer_phone: Optional[str] = None
+    language: str
 
 class CallCreate(CallBase):
     pass
@@ -19,6 +20,7 @@ class CallResponse(CallBase):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     duration: Optional[int] = None
+    version: int
     created_at: datetime
 
     class Config:
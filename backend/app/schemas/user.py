@@ -10,6 +10,10 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str
+    languages: Optional[List[str]] = None  # Call center skills of an agent
+
+class AgentLanguagesUpdate(BaseModel):
+    languages: List[str]
 
 class UserResponse(UserBase):
     id: UUID
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import Counter
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.call import CallStatus
+from app.models.user import AgentState, User, UserRole
+
+# Agent state implied by the status of the call the agent is assigned to
+AGENT_STATE_BY_CALL_STATUS = {
+    CallStatus.WAITING: AgentState.IDLE,
+    CallStatus.RINGING: AgentState.RINGING,
+    CallStatus.ACTIVE: AgentState.BUSY,
+    CallStatus.ENDED: AgentState.IDLE,
+    CallStatus.MISSED: AgentState.IDLE,
+}
+
+
+class AgentRegistry:
+    """
+    In-process occupancy index of call center agents
+
+    users.agent_state is the source of truth and is changed on call
+    transitions. The registry mirrors it and keeps the idle agents per skill
+    (the agent's languages, None for all) in insertion-ordered dicts, so the
+    longest-idle agents are found in O(1) per agent instead of anti-joining
+    the calls table. It is reloaded after a TTL to pick up transitions made
+    through other workers.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._states: Dict[UUID, AgentState] = {}
+        self._skills: Dict[UUID, Tuple[str, ...]] = {}
+        self._idle: Dict[Optional[str], Dict[UUID, None]] = {None: {}}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        """Rebuild the registry from the users table"""
+        rows = db.query(User.id, User.languages, User.agent_state).filter(
+            User.role == UserRole.AGENT
+        ).all()
+
+        with self._lock:
+            self._states = {}
+            self._skills = {}
+            self._idle = {None: {}}
+            for agent_id, languages, state in rows:
+                self._skills[agent_id] = tuple(languages or ())
+                self._set(agent_id, state)
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+            self.load(db)
+
+    def upsert(self, user: User):
+        """Register or refresh an agent after it was created or updated"""
+        if self._loaded_at is None:
+            return  # Picked up by the first load
+
+        with self._lock:
+            if user.id in self._states:
+                self._unset(user.id)
+            if user.role == UserRole.AGENT:
+                self._skills[user.id] = tuple(user.languages or ())
+                self._set(user.id, user.agent_state or AgentState.OFFLINE)
+            else:
+                self._skills.pop(user.id, None)
+
+    def set_state(self, agent_id: UUID, state: AgentState):
+        """Record a committed state change; unknown ids wait for the next load"""
+        with self._lock:
+            if agent_id not in self._states:
+                return
+            self._unset(agent_id)
+            self._set(agent_id, state)
+
+    def invalidate(self):
+        """Force a reload on the next lookup, e.g. after a claim hit a stale entry"""
+        self._loaded_at = None
+
+    def state(self, agent_id: UUID) -> Optional[AgentState]:
+        return self._states.get(agent_id)
+
+    def idle_agents(self, db: Session, skill: Optional[str] = None, limit: Optional[int] = None) -> List[UUID]:
+        """Idle agents with the skill (any if None), longest idle first"""
+        self.ensure_loaded(db)
+        with self._lock:
+            return list(islice(self._idle.get(skill, {}), limit))
+
+    def idle_count(self, skill: Optional[str] = None) -> int:
+        return len(self._idle.get(skill, ()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "agents": len(self._states),
+                "states": dict(Counter(state.value for state in self._states.values())),
+                "idleBySkill": {
+                    skill: len(members) for skill, members in self._idle.items() if skill is not None
+                },
+            }
+
+    def _set(self, agent_id: UUID, state: AgentState):
+        self._states[agent_id] = state
+        if state == AgentState.IDLE:
+            # Re-inserting moves the agent to the back: longest idle stays first
+            self._idle[None][agent_id] = None
+            for skill in self._skills.get(agent_id, ()):
+                self._idle.setdefault(skill, {})[agent_id] = None
+
+    def _unset(self, agent_id: UUID):
+        if self._states.pop(agent_id, None) == AgentState.IDLE:
+            self._idle[None].pop(agent_id, None)
+            for skill in self._skills.get(agent_id, ()):
+                members = self._idle.get(skill)
+                if members is not None:
+                    members.pop(agent_id, None)
+
+
+agent_registry = AgentRegistry(ttl_seconds=settings.AGENT_REGISTRY_TTL_SECONDS)
@@ -0,0 +1,146 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Sequence
+from uuid import UUID
+
+from app.services.availability_service import Interval
+from app.services.translator_index import TranslatorInfo
+
+
+@dataclass(frozen=True)
+class InterpretationNeed:
+    index: int
+    language: str
+    start_time: datetime
+    end_time: datetime
+
+
+def is_free(intervals: List[Interval], start_time: datetime, end_time: datetime) -> bool:
+    return not any(start < end_time and start_time < end for start, end in intervals)
+
+
+def overlaps(a: InterpretationNeed, b: InterpretationNeed) -> bool:
+    return a.start_time < b.end_time and b.start_time < a.end_time
+
+
+def overlapping_components(needs: Sequence[InterpretationNeed]) -> List[List[InterpretationNeed]]:
+    """Split needs into start-ordered runs chained together by overlapping intervals"""
+    components: List[List[InterpretationNeed]] = []
+    reach = None
+    for need in sorted(needs, key=lambda need: (need.start_time, need.end_time)):
+        if reach is None or need.start_time >= reach:
+            components.append([])
+            reach = need.end_time
+        components[-1].append(need)
+        reach = max(reach, need.end_time)
+    return components
+
+
+def solve_assignments(
+    needs: Sequence[InterpretationNeed],
+    candidates_by_language: Dict[str, List[TranslatorInfo]],
+    busy: Dict[UUID, List[Interval]]
+) -> Dict[int, TranslatorInfo]:
+    """
+    Assign translators to many interpretation needs at once
+
+    Needs are split into components chained together by overlapping
+    intervals; needs in different components never compete for a
+    translator. Each component is solved as a matching (greedy seed plus
+    augmenting paths) in which a translator can hold several needs as long
+    as they do not overlap. An augmenting path may move the one assigned
+    need that blocks a translator to another translator, which fills slots
+    one-by-one greedy booking leaves empty, e.g. when a multilingual
+    translator is taken by a need someone else could cover. A translator
+    blocked by two or more assigned needs is not displaced, so the result
+    is maximal rather than guaranteed maximum. Translators are tried
+    least-loaded and cheapest first.
+
+    Args:
+        needs: Requested slots
+        candidates_by_language: Available translators per language
+        busy: Already booked intervals per translator
+
+    Returns:
+        dict: Need index -> assigned translator; unfilled needs are absent
+    """
+    busy = defaultdict(list, {key: list(value) for key, value in busy.items()})
+    load = defaultdict(float)  # Seconds assigned so far, for balancing
+    for translator_id, intervals in busy.items():
+        load[translator_id] = sum((end - start).total_seconds() for start, end in intervals)
+
+    assignment: Dict[int, TranslatorInfo] = {}
+
+    for component in overlapping_components(needs):
+        # Translators free of existing bookings per (language, start, end)
+        adjacency: Dict[tuple, List[TranslatorInfo]] = {}
+        for need in component:
+            key = (need.language, need.start_time, need.end_time)
+            if key not in adjacency:
+                free = [
+                    info for info in candidates_by_language.get(need.language, ())
+                    if is_free(busy[info.id], need.start_time, need.end_time)
+                ]
+                free.sort(key=lambda info: (load[info.id], info.rate_amount or 0.0, info.name))
+                adjacency[key] = free
+
+        def neighbours(need: InterpretationNeed) -> List[TranslatorInfo]:
+            return adjacency[(need.language, need.start_time, need.end_time)]
+
+        held: Dict[UUID, List[InterpretationNeed]] = defaultdict(list)
+        matched: Dict[InterpretationNeed, TranslatorInfo] = {}
+
+        def blockers(info: TranslatorInfo, need: InterpretationNeed) -> List[InterpretationNeed]:
+            return [other for other in held[info.id] if other is not need and overlaps(other, need)]
+
+        def move(need: InterpretationNeed, info: TranslatorInfo):
+            previous = matched.get(need)
+            if previous is not None:
+                held[previous.id].remove(need)
+            held[info.id].append(need)
+            matched[need] = info
+
+        # Greedy seed: first translator not already holding an overlapping need
+        for need in component:
+            for info in neighbours(need):
+                if not blockers(info, need):
+                    move(need, info)
+                    break
+
+        # Augmenting paths for the needs the seed left unmatched
+        for root in component:
+            if root in matched:
+                continue
+            visited = set()
+            stack = [(root, iter(neighbours(root)))]
+            path: List[TranslatorInfo] = []
+            while stack:
+                need, options = stack[-1]
+                for info in options:
+                    if info.id in visited:
+                        continue
+                    blocking = blockers(info, need)
+                    if len(blocking) > 1:
+                        continue
+                    visited.add(info.id)
+                    path.append(info)
+                    if not blocking:
+                        # Every need along the path moves to the next translator
+                        for (path_need, _), path_info in zip(stack, path):
+                            move(path_need, path_info)
+                        stack = []
+                    else:
+                        stack.append((blocking[0], iter(neighbours(blocking[0]))))
+                    break
+                else:
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+        for need, info in matched.items():
+            busy[info.id].append((need.start_time, need.end_time))
+            load[info.id] += (need.end_time - need.start_time).total_seconds()
+            assignment[need.index] = info
+
+    return assignment
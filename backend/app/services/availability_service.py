@@ -0,0 +1,104 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, ACTIVE_BOOKING_STATUSES
+
+SLOT_STEP_MINUTES = 30
+
+Interval = Tuple[datetime, datetime]
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to the naive UTC form stored in the database"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def align_to_slot(value: datetime) -> datetime:
+    """Round a datetime up to the next slot boundary (:00 or :30)"""
+    aligned = value.replace(second=0, microsecond=0)
+    if aligned < value:
+        aligned += timedelta(minutes=1)
+    remainder = aligned.minute % SLOT_STEP_MINUTES
+    if remainder:
+        aligned += timedelta(minutes=SLOT_STEP_MINUTES - remainder)
+    return aligned
+
+
+def load_busy_intervals(
+    db: Session,
+    translator_ids: Iterable[UUID],
+    window_start: datetime,
+    window_end: datetime
+) -> Dict[UUID, List[Interval]]:
+    """Fetch the active booked intervals of many translators in one query"""
+    translator_ids = list(translator_ids)
+    busy = defaultdict(list)
+    if not translator_ids:
+        return busy
+
+    rows = db.query(
+        Booking.translator_id,
+        Booking.start_time,
+        Booking.duration_minutes
+    ).filter(
+        Booking.translator_id.in_(translator_ids),
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        Booking.overlapping(window_start, window_end)
+    ).all()
+
+    for translator_id, start_time, duration_minutes in rows:
+        busy[translator_id].append(
+            (start_time, start_time + timedelta(minutes=duration_minutes))
+        )
+    return busy
+
+
+def find_free_slots(
+    busy: Iterable[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration_minutes: int
+) -> List[datetime]:
+    """
+    Sweep a translator's booked intervals and return free slot start times
+
+    Args:
+        busy: Booked (start, end) intervals of one translator, in any order.
+            Intervals never overlap each other (enforced by the database).
+        window_start: Start of the search window
+        window_end: End of the search window
+        duration_minutes: Length of each slot
+
+    Returns:
+        list: Slot start times on the 30-minute grid that fit entirely
+        inside the window without overlapping a booking
+    """
+    length = timedelta(minutes=duration_minutes)
+    step = timedelta(minutes=SLOT_STEP_MINUTES)
+    intervals = sorted(busy)
+    slots = []
+
+    index = 0
+    slot_start = align_to_slot(window_start)
+    while slot_start + length <= window_end:
+        slot_end = slot_start + length
+
+        # Drop bookings that finished before this slot starts
+        while index < len(intervals) and intervals[index][1] <= slot_start:
+            index += 1
+
+        if index < len(intervals) and intervals[index][0] < slot_end:
+            # Jump past the blocking booking instead of stepping through it
+            slot_start = align_to_slot(intervals[index][1])
+            continue
+
+        slots.append(slot_start)
+        slot_start += step
+
+    return slots
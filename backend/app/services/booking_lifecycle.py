@@ -0,0 +1,113 @@
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.booking import Booking, BookingStatus, booking_end_time
+from app.services.periodic_task import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+class BookingLifecycleEngine(PeriodicTask):
+    """
+    Background task moving due bookings CONFIRMED -> IN_PROGRESS -> COMPLETED
+
+    Each tick runs set-based UPDATEs in batches. Due rows are claimed with
+    FOR UPDATE SKIP LOCKED, so several API workers can run the engine at once
+    without blocking each other or moving a row twice.
+    """
+
+    def __init__(self, interval_seconds: float, batch_size: int):
+        super().__init__(interval_seconds)
+        self.batch_size = batch_size
+
+        self.ticks = 0
+        self.total_started = 0
+        self.total_completed = 0
+        self.last_tick: Optional[dict] = None
+
+    def _move(self, db: Session, from_statuses: List[BookingStatus], to_status: BookingStatus, due) -> int:
+        """Move due bookings to a new status in batches, returning the row count"""
+        moved = 0
+        while True:
+            batch = select(Booking.id).where(
+                Booking.status.in_(from_statuses),
+                due
+            ).order_by(Booking.start_time).limit(self.batch_size).with_for_update(skip_locked=True)
+
+            result = db.execute(
+                update(Booking)
+                .where(Booking.id.in_(batch))
+                .values(status=to_status, updated_at=datetime.utcnow(), version=Booking.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            moved += result.rowcount
+            if result.rowcount < self.batch_size:
+                return moved
+
+    def tick(self, now: Optional[datetime] = None) -> dict:
+        """Run one pass over due bookings"""
+        now = now or datetime.utcnow()
+        started_at = time.perf_counter()
+
+        db = SessionLocal()
+        try:
+            completed = self._move(
+                db,
+                [BookingStatus.CONFIRMED, BookingStatus.IN_PROGRESS],
+                BookingStatus.COMPLETED,
+                booking_end_time(Booking.start_time, Booking.duration_minutes) <= now
+            )
+            started = self._move(
+                db,
+                [BookingStatus.CONFIRMED],
+                BookingStatus.IN_PROGRESS,
+                Booking.start_time <= now
+            )
+        finally:
+            db.close()
+
+        self.ticks += 1
+        self.total_started += started
+        self.total_completed += completed
+        self.last_tick = {
+            "at": now.isoformat(),
+            "started": started,
+            "completed": completed,
+            "durationMs": round((time.perf_counter() - started_at) * 1000, 2),
+        }
+
+        if started or completed:
+            logger.info(
+                "Booking lifecycle tick: %d started, %d completed in %.1f ms",
+                started, completed, self.last_tick["durationMs"]
+            )
+        return self.last_tick
+
+    async def run_once(self):
+        await run_in_threadpool(self.tick)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "intervalSeconds": self.interval_seconds,
+            "ticks": self.ticks,
+            "totalStarted": self.total_started,
+            "totalCompleted": self.total_completed,
+            "lastTick": self.last_tick,
+        }
+
+
+booking_lifecycle = BookingLifecycleEngine(
+    interval_seconds=settings.BOOKING_LIFECYCLE_INTERVAL_SECONDS,
+    batch_size=settings.BOOKING_LIFECYCLE_BATCH_SIZE,
+)
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.availability_service import Interval, load_busy_intervals
+
+
+@dataclass
+class CalendarEntry:
+    horizon_start: datetime
+    horizon_end: datetime
+    intervals: List[Interval]
+    loaded_at: float
+
+
+class TranslatorCalendarCache:
+    """
+    In-process LRU cache of each translator's booked intervals over the upcoming horizon
+
+    Booking write paths call invalidate() after committing, so readers in this
+    process never see a stale calendar. Entries also expire after a TTL to
+    bound staleness from writes made by other workers. Double-booking is still
+    prevented by the database, so the cache only ever serves reads.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, horizon_days: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.horizon_days = horizon_days
+
+        self._entries: "OrderedDict[UUID, CalendarEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def horizon(self, now: Optional[datetime] = None) -> Interval:
+        """Window cached per translator: from the start of today for horizon_days"""
+        now = now or datetime.utcnow()
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start, start + timedelta(days=self.horizon_days + 1)
+
+    def get_busy(
+        self,
+        db: Session,
+        translator_ids: Iterable[UUID],
+        window_start: datetime,
+        window_end: datetime
+    ) -> Dict[UUID, List[Interval]]:
+        """
+        Get booked intervals for many translators, loading cache misses in one query
+
+        Windows reaching outside the cached horizon bypass the cache entirely.
+        """
+        translator_ids = list(translator_ids)
+        horizon_start, horizon_end = self.horizon()
+        if window_start < horizon_start or window_end > horizon_end:
+            return load_busy_intervals(db, translator_ids, window_start, window_end)
+
+        busy = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            writes_before_load = self._writes
+            for translator_id in translator_ids:
+                entry = self._entries.get(translator_id)
+                if (
+                    entry is not None
+                    and entry.horizon_start == horizon_start
+                    and now - entry.loaded_at < self.ttl_seconds
+                ):
+                    self._entries.move_to_end(translator_id)
+                    busy[translator_id] = entry.intervals
+                    self.hits += 1
+                else:
+                    missing.append(translator_id)
+                    self.misses += 1
+
+        if not missing:
+            return busy
+
+        loaded = load_busy_intervals(db, missing, horizon_start, horizon_end)
+        with self._lock:
+            # Skip storing if a booking write raced with the load
+            store = self._writes == writes_before_load
+            for translator_id in missing:
+                intervals = loaded.get(translator_id, [])
+                busy[translator_id] = intervals
+                if store:
+                    self._entries[translator_id] = CalendarEntry(
+                        horizon_start, horizon_end, intervals, now
+                    )
+                    self._entries.move_to_end(translator_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return busy
+
+    def invalidate(self, *translator_ids: UUID):
+        """Drop cached calendars after their bookings changed"""
+        with self._lock:
+            self._writes += 1
+            for translator_id in translator_ids:
+                if self._entries.pop(translator_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._writes += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+calendar_cache = TranslatorCalendarCache(
+    max_size=settings.CALENDAR_CACHE_SIZE,
+    ttl_seconds=settings.CALENDAR_CACHE_TTL_SECONDS,
+    horizon_days=settings.CALENDAR_CACHE_HORIZON_DAYS,
+)
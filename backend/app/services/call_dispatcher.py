@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.connection_manager import manager
+from app.services.latency import latency_summary
+from app.services.periodic_task import PeriodicTask
+from app.services.queue_engine import queue_engine
+from app.services.queue_manager import AssignmentRound, QueueManager
+from app.services.topics import QUEUE_TOPIC, agent_topic
+from app.services.wait_estimator import wait_estimator
+
+# Start times older than this are dropped; such calls ended, were abandoned or were rung elsewhere
+RING_LATENCY_MAX_AGE_SECONDS = 3600
+
+
+class CallDispatcher(PeriodicTask):
+    """
+    Lifespan-managed task routing waiting calls to free agents
+
+    The loop sleeps on an asyncio.Event and runs an assignment round as soon
+    as a call is started or an agent is freed. A slow fallback wake-up covers
+    events raised by other workers. Assignments are pushed to the agent's
+    and the queue topic, and the time from call start to ringing is tracked for calls
+    started in this process. Every resync_interval_seconds a round first
+    re-syncs the in-memory queue with the queue table, dropping calls that
+    other workers dequeued.
+    """
+
+    def __init__(self, fallback_interval_seconds: float, resync_interval_seconds: float):
+        super().__init__(fallback_interval_seconds)
+        self.resync_interval_seconds = resync_interval_seconds
+        self._resynced_at = time.monotonic()  # The lifespan rebuilds the queue at startup
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._started_at: OrderedDict[UUID, float] = OrderedDict()
+
+        self.rounds = 0
+        self.assigned = 0
+        self.last_round_ms: Optional[float] = None
+        self.ring_latencies_ms = deque(maxlen=1000)
+
+    def notify(self, call_id: Optional[UUID] = None):
+        """Wake the dispatcher; pass call_id when a new call was started"""
+        if call_id is not None:
+            now = time.perf_counter()
+            self._started_at[call_id] = now
+            # Insertion order is start order, so expired entries are at the front
+            while self._started_at and next(iter(self._started_at.values())) < now - RING_LATENCY_MAX_AGE_SECONDS:
+                self._started_at.popitem(last=False)
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _dispatch_round(self) -> AssignmentRound:
+        db = SessionLocal()
+        try:
+            if time.monotonic() - self._resynced_at >= self.resync_interval_seconds:
+                for call_id in queue_engine.rebuild(db):
+                    wait_estimator.record_abandoned(call_id)
+                self._resynced_at = time.monotonic()
+            return QueueManager(db).auto_assign_calls()
+        finally:
+            db.close()
+
+    async def wait(self):
+        """Sleep until notified, or the fallback interval at most"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def run_once(self):
+        assignment_round = await run_in_threadpool(self._dispatch_round)
+        self.rounds += 1
+        self.assigned += len(assignment_round.assignments)
+        self.last_round_ms = assignment_round.latency_ms
+
+        rung_at = time.perf_counter()
+        for call_id, agent_id in assignment_round.assignments:
+            started_at = self._started_at.pop(call_id, None)
+            if started_at is not None:
+                self.ring_latencies_ms.append((rung_at - started_at) * 1000)
+
+            await manager.broadcast(
+                {"type": "call_assigned", "data": {"callId": str(call_id), "agentId": str(agent_id)}},
+                topics=[agent_topic(agent_id), QUEUE_TOPIC]
+            )
+
+    def start(self):
+        if not self.running:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+        super().start()  # The first round drains calls left waiting before startup
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "rounds": self.rounds,
+            "assigned": self.assigned,
+            "lastRoundMs": self.last_round_ms,
+            "ringLatencyMs": latency_summary(self.ring_latencies_ms),
+            "trackedStarts": len(self._started_at),
+            "queue": queue_engine.stats(),
+        }
+
+
+call_dispatcher = CallDispatcher(
+    fallback_interval_seconds=settings.DISPATCHER_FALLBACK_INTERVAL_SECONDS,
+    resync_interval_seconds=settings.QUEUE_RESYNC_INTERVAL_SECONDS,
+)
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.call import Call, CallStatus
+from app.services.periodic_task import PeriodicTask
+from app.services.wait_estimator import wait_estimator
+
+logger = logging.getLogger(__name__)
+
+
+class CallMetrics(PeriodicTask):
+    """
+    Call center counters maintained on call transitions
+
+    Counts per status and the duration sum are the last reconciled totals
+    plus the changes this worker made since. A background task reconciles
+    them with a single aggregate query over calls, which also picks up
+    transitions made through other workers. Readers get a snapshot that is
+    rebuilt from the counters at most every max_staleness_seconds, so the
+    metrics endpoint never touches the calls table.
+    """
+
+    def __init__(self, reconcile_interval_seconds: float, max_staleness_seconds: float):
+        super().__init__(reconcile_interval_seconds)
+        self.max_staleness_seconds = max_staleness_seconds
+        self._lock = threading.Lock()
+
+        self._counts: Counter = Counter()
+        self._duration_sum = 0
+        self._duration_count = 0
+        # Changes since the last reconcile, so one that races the aggregate query is not lost
+        self._pending_counts: Counter = Counter()
+        self._pending_duration_sum = 0
+        self._pending_duration_count = 0
+
+        self._snapshot: Optional[dict] = None
+        self._snapshot_at = 0.0
+        self.reconciled_at: Optional[float] = None
+        self.reconciles = 0
+        self.last_drift: Optional[dict] = None
+
+    def record_transition(
+        self,
+        old_status: Optional[CallStatus],
+        new_status: CallStatus,
+        old_duration: Optional[int] = None,
+        new_duration: Optional[int] = None,
+        count: int = 1
+    ):
+        """Apply a committed status change; old_status None for a new call"""
+        with self._lock:
+            for counts in (self._counts, self._pending_counts):
+                if old_status is not None:
+                    counts[old_status] -= count
+                counts[new_status] += count
+
+            if old_duration != new_duration:
+                duration_delta = (new_duration or 0) - (old_duration or 0)
+                count_delta = (new_duration is not None) - (old_duration is not None)
+                self._duration_sum += duration_delta
+                self._duration_count += count_delta
+                self._pending_duration_sum += duration_delta
+                self._pending_duration_count += count_delta
+
+    def reconcile(self, db: Session) -> dict:
+        """Reset the counters from one aggregate query over calls"""
+        with self._lock:
+            pending_counts = Counter(self._pending_counts)
+            pending_duration = (self._pending_duration_sum, self._pending_duration_count)
+
+        row = db.query(
+            *[func.count().filter(Call.status == call_status) for call_status in CallStatus],
+            func.coalesce(func.sum(Call.duration), 0),
+            func.count(Call.duration),
+        ).one()
+        counts = Counter({call_status: row[i] for i, call_status in enumerate(CallStatus)})
+
+        with self._lock:
+            # Keep only changes committed after the query was taken
+            self._pending_counts.subtract(pending_counts)
+            self._pending_duration_sum -= pending_duration[0]
+            self._pending_duration_count -= pending_duration[1]
+
+            drift = {
+                call_status.value: counts[call_status] - self._counts[call_status] + self._pending_counts[call_status]
+                for call_status in CallStatus
+            }
+            self.last_drift = {key: value for key, value in drift.items() if value}
+
+            self._counts = counts + Counter()
+            self._counts.update(self._pending_counts)
+            self._duration_sum = int(row[-2]) + self._pending_duration_sum
+            self._duration_count = int(row[-1]) + self._pending_duration_count
+            self._snapshot = None
+            self.reconciled_at = time.time()
+            self.reconciles += 1
+            return self.last_drift
+
+    def count(self, call_status: CallStatus) -> int:
+        return max(0, self._counts[call_status])
+
+    def snapshot(self, db: Optional[Session] = None) -> dict:
+        """Metrics at most max_staleness_seconds old"""
+        if self.reconciled_at is None and db is not None:
+            self.reconcile(db)
+
+        now = time.monotonic()
+        with self._lock:
+            if self._snapshot is None or now - self._snapshot_at > self.max_staleness_seconds:
+                self._snapshot = {
+                    "totalCalls": sum(max(0, value) for value in self._counts.values()),
+                    "activeCalls": max(0, self._counts[CallStatus.ACTIVE]),
+                    "waitingCalls": max(0, self._counts[CallStatus.WAITING]),
+                    "averageWaitTime": int(wait_estimator.average_wait_seconds() or 0),
+                    "averageCallDuration": int(self._duration_sum / self._duration_count) if self._duration_count else 0,
+                }
+                self._snapshot_at = now
+            return dict(self._snapshot)
+
+    def _reconcile_once(self):
+        db = SessionLocal()
+        try:
+            drift = self.reconcile(db)
+        finally:
+            db.close()
+        if drift:
+            logger.info("Call metrics reconciled with drift %s", drift)
+
+    async def run_once(self):
+        await run_in_threadpool(self._reconcile_once)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "reconcileIntervalSeconds": self.interval_seconds,
+            "maxStalenessSeconds": self.max_staleness_seconds,
+            "reconciles": self.reconciles,
+            "reconciledAt": self.reconciled_at,
+            "lastDrift": self.last_drift,
+            "counts": {call_status.value: self._counts[call_status] for call_status in CallStatus},
+        }
+
+
+call_metrics = CallMetrics(
+    reconcile_interval_seconds=settings.METRICS_RECONCILE_INTERVAL_SECONDS,
+    max_staleness_seconds=settings.METRICS_MAX_STALENESS_SECONDS,
+)
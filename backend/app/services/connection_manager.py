@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import WebSocket, status
+
+from app.core.config import settings
+from app.services.event_bus import EventBus, create_event_bus
+from app.services.latency import latency_summary
+
+logger = logging.getLogger(__name__)
+
+
+class ClientConnection:
+    """A websocket with its own bounded send queue drained by a sender task"""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[Tuple[str, float]] = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.topics: Set[str] = set()
+
+
+class ConnectionManager:
+    """
+    Websocket fan-out
+
+    Broadcasts are addressed to topics and go through the event bus, so they
+    reach the sockets of every worker. Each worker looks the recipients up in
+    a topic -> connections index, serializes the message once and puts the
+    text on each subscriber's bounded queue without awaiting any socket. Each connection
+    has a sender task that writes its queue with a per-send timeout, so a
+    stalled client only delays itself. Connections whose send fails or times
+    out, or whose queue is full, are evicted and closed.
+    """
+
+    def __init__(self, queue_size: int, send_timeout_seconds: float, bus: EventBus):
+        self.queue_size = queue_size
+        self.bus = bus
+        self.send_timeout_seconds = send_timeout_seconds
+        self.active_connections: Dict[WebSocket, ClientConnection] = {}
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+        self.broadcasts = 0
+        self.delivered = 0
+        self.evicted_dead = 0
+        self.evicted_slow = 0
+        self.fanout_latencies_ms = deque(maxlen=5000)  # Broadcast to socket write, per delivery
+        self.enqueue_latencies_ms = deque(maxlen=1000)  # Time spent inside broadcast()
+
+    async def start(self):
+        await self.bus.start(self.deliver)
+
+    async def stop(self):
+        await self.bus.stop()
+        for websocket in list(self.active_connections):
+            self.disconnect(websocket)
+
+    async def connect(self, websocket: WebSocket, topics: Iterable[str] = ()):
+        await websocket.accept()
+        connection = ClientConnection(websocket, self.queue_size)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        self.active_connections[websocket] = connection
+        self.subscribe(websocket, topics)
+
+    def disconnect(self, websocket: WebSocket):
+        connection = self.active_connections.pop(websocket, None)
+        if connection is not None:
+            self._unsubscribe_all(connection)
+            if connection.sender is not None:
+                connection.sender.cancel()
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return
+        for topic in topics:
+            connection.topics.add(topic)
+            self.subscribers.setdefault(topic, set()).add(connection)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return
+        for topic in topics:
+            connection.topics.discard(topic)
+            members = self.subscribers.get(topic)
+            if members is not None:
+                members.discard(connection)
+                if not members:
+                    del self.subscribers[topic]
+
+    def topics(self, websocket: WebSocket) -> Set[str]:
+        connection = self.active_connections.get(websocket)
+        return set(connection.topics) if connection else set()
+
+    def send(self, websocket: WebSocket, message: dict):
+        """Queue a message for one client, behind its pending broadcasts"""
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return
+        try:
+            connection.queue.put_nowait((json.dumps(message), time.perf_counter()))
+        except asyncio.QueueFull:
+            self.evicted_slow += 1
+            self._evict(connection, "send queue full")
+
+    async def broadcast(self, message: dict, topics: Iterable[str], local: bool = False):
+        """Publish a message to the subscribers of the topics on all workers, or only this one"""
+        event = {"topics": list(topics), "message": message}
+        if local:
+            await self.deliver(event)
+        else:
+            await self.bus.publish(event)
+
+    async def deliver(self, event: dict):
+        """Fan a published message out to this worker's subscribers"""
+        started_at = time.perf_counter()
+        recipients = set()
+        for topic in event["topics"]:
+            recipients.update(self.subscribers.get(topic, ()))
+        if not recipients:
+            return
+
+        text = json.dumps(event["message"])
+        self.broadcasts += 1
+
+        for connection in recipients:
+            try:
+                connection.queue.put_nowait((text, started_at))
+            except asyncio.QueueFull:
+                self.evicted_slow += 1
+                self._evict(connection, "send queue full")
+
+        self.enqueue_latencies_ms.append((time.perf_counter() - started_at) * 1000)
+
+    async def _send_loop(self, connection: ClientConnection):
+        while True:
+            text, broadcast_at = await connection.queue.get()
+            try:
+                async with asyncio.timeout(self.send_timeout_seconds):
+                    await connection.websocket.send_text(text)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self.evicted_slow += 1
+                self._evict(connection, "send timed out")
+                return
+            except Exception:
+                self.evicted_dead += 1
+                self._evict(connection, "send failed")
+                return
+
+            self.delivered += 1
+            self.fanout_latencies_ms.append((time.perf_counter() - broadcast_at) * 1000)
+
+    def _evict(self, connection: ClientConnection, reason: str):
+        if self.active_connections.pop(connection.websocket, None) is None:
+            return
+        self._unsubscribe_all(connection)
+        logger.info("Evicting websocket client: %s", reason)
+        if connection.sender is not None and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+        task = asyncio.create_task(self._close(connection.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _unsubscribe_all(self, connection: ClientConnection):
+        for topic in connection.topics:
+            members = self.subscribers.get(topic)
+            if members is not None:
+                members.discard(connection)
+                if not members:
+                    del self.subscribers[topic]
+        connection.topics.clear()
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=status.WS_1008_POLICY_VIOLATION),
+                timeout=self.send_timeout_seconds
+            )
+        except Exception:
+            pass  # Already gone
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self.active_connections),
+            "topics": len(self.subscribers),
+            "subscriptions": sum(len(members) for members in self.subscribers.values()),
+            "broadcasts": self.broadcasts,
+            "delivered": self.delivered,
+            "evictedDead": self.evicted_dead,
+            "evictedSlow": self.evicted_slow,
+            "fanoutLatencyMs": latency_summary(self.fanout_latencies_ms),
+            "broadcastEnqueueMs": latency_summary(self.enqueue_latencies_ms),
+            "bus": self.bus.stats(),
+        }
+
+
+manager = ConnectionManager(
+    queue_size=settings.WS_SEND_QUEUE_SIZE,
+    send_timeout_seconds=settings.WS_SEND_TIMEOUT_SECONDS,
+    bus=create_event_bus()
+)
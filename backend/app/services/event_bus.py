@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Awaitable, Callable, Optional, Set
+
+import psycopg2
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.latency import latency_summary
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+# NOTIFY payloads must stay below 8000 bytes
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+
+class EventBus(ABC):
+    """
+    Publish/subscribe transport behind ConnectionManager
+
+    Messages are wrapped in an envelope carrying the publishing worker and
+    the publish time, so every worker can measure delivery latency. The
+    handler passed to start() receives the original message.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._handler: Optional[Handler] = None
+        # Dispatches started from loop callbacks; referenced until done so they are not collected
+        self._dispatching: Set[asyncio.Task] = set()
+
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+        self.delivery_latencies_ms = deque(maxlen=5000)
+
+    async def start(self, handler: Handler):
+        self._handler = handler
+
+    async def stop(self):
+        self._handler = None
+
+    @abstractmethod
+    async def publish(self, message: dict):
+        """Deliver message to the handler of every subscribed worker"""
+
+    async def _dispatch(self, envelope: dict):
+        if self._handler is None:
+            self.dropped += 1
+            return
+
+        self.received += 1
+        self.delivery_latencies_ms.append(max(0.0, (time.time() - envelope["publishedAt"]) * 1000))
+        try:
+            await self._handler(envelope["message"])
+        except Exception:
+            self.dropped += 1
+            logger.exception("Event handler failed")
+
+    def _envelope(self, message: dict) -> dict:
+        return {"origin": self.worker_id, "publishedAt": time.time(), "message": message}
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "workerId": self.worker_id,
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped,
+            "deliveryLatencyMs": latency_summary(self.delivery_latencies_ms),
+        }
+
+
+class InProcessEventBus(EventBus):
+    """Default bus: delivers to this worker's sockets only"""
+
+    name = "memory"
+
+    async def publish(self, message: dict):
+        self.published += 1
+        await self._dispatch(self._envelope(message))
+
+
+class PostgresEventBus(EventBus):
+    """
+    Bus over Postgres LISTEN/NOTIFY, reaching the sockets of every worker
+
+    Each worker keeps one autocommit connection listening on the channel and
+    watched by the event loop, so no extra service is needed. Publishing runs
+    pg_notify through the regular connection pool. Payloads over the NOTIFY
+    size limit and failed publishes are counted as dropped. A lost listener
+    connection is re-established after a delay.
+    """
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, channel: str, engine, reconnect_seconds: float = 2.0):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self.engine = engine
+        self.reconnect_seconds = reconnect_seconds
+        self._listener = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self.reconnects = 0
+
+    async def start(self, handler: Handler):
+        await super().start(handler)
+        self._loop = asyncio.get_running_loop()
+        await self._listen()
+
+    async def stop(self):
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._close_listener()
+        await super().stop()
+
+    async def publish(self, message: dict):
+        payload = json.dumps(self._envelope(message))
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD_BYTES:
+            self.dropped += 1
+            logger.warning("Event dropped: payload exceeds the NOTIFY limit")
+            return
+
+        try:
+            await run_in_threadpool(self._notify, payload)
+        except Exception:
+            self.dropped += 1
+            logger.exception("Event publish failed")
+            return
+        self.published += 1
+
+    def _notify(self, payload: str):
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+            connection.commit()
+
+    async def _listen(self):
+        def connect():
+            listener = psycopg2.connect(self.dsn)
+            listener.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with listener.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            return listener
+
+        self._listener = await run_in_threadpool(connect)
+        self._loop.add_reader(self._listener.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        try:
+            self._listener.poll()
+        except Exception:
+            logger.exception("Event listener connection lost")
+            self._close_listener()
+            self._reconnect_task = self._loop.create_task(self._reconnect())
+            return
+
+        while self._listener.notifies:
+            notify = self._listener.notifies.pop(0)
+            try:
+                envelope = json.loads(notify.payload)
+            except ValueError:
+                self.dropped += 1
+                continue
+            task = self._loop.create_task(self._dispatch(envelope))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _reconnect(self):
+        while True:
+            await asyncio.sleep(self.reconnect_seconds)
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception("Event listener reconnect failed")
+                continue
+            self.reconnects += 1
+            return
+
+    def _close_listener(self):
+        if self._listener is None:
+            return
+        try:
+            self._loop.remove_reader(self._listener.fileno())
+        except Exception:
+            pass
+        try:
+            self._listener.close()
+        except Exception:
+            pass
+        self._listener = None
+
+    def stats(self) -> dict:
+        return {**super().stats(), "channel": self.channel, "reconnects": self.reconnects}
+
+
+def create_event_bus() -> EventBus:
+    """Bus selected by EVENT_BUS_BACKEND"""
+    if settings.EVENT_BUS_BACKEND == "postgres":
+        from app.db.session import engine
+        return PostgresEventBus(settings.DATABASE_URL, settings.EVENT_BUS_CHANNEL, engine)
+    return InProcessEventBus()
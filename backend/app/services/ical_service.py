@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+from app.models.booking import Booking, BookingStatus
+
+ICAL_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+ICAL_STATUS = {
+    BookingStatus.PENDING: "TENTATIVE",
+    BookingStatus.CONFIRMED: "CONFIRMED",
+    BookingStatus.IN_PROGRESS: "CONFIRMED",
+    BookingStatus.COMPLETED: "CONFIRMED",
+    BookingStatus.CANCELLED: "CANCELLED",
+}
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value (RFC 5545 section 3.3.11)"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75 octets and terminate it with CRLF"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    current = b""
+    limit = 75
+    for char in line:
+        char_bytes = char.encode("utf-8")
+        if len(current) + len(char_bytes) > limit:
+            parts.append(current.decode("utf-8"))
+            current = b""
+            limit = 74  # Continuation lines start with a space
+        current += char_bytes
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_event(booking: Booking) -> str:
+    """Render one booking as a VEVENT block"""
+    end_time = booking.start_time + timedelta(minutes=booking.duration_minutes)
+    stamp = booking.updated_at or booking.created_at or datetime.utcnow()
+
+    description = [
+        f"Translator: {booking.translator_name}",
+        f"Employee: {booking.employee_name}",
+        f"Company: {booking.company_name}",
+    ]
+    if booking.notes:
+        description.append(f"Notes: {booking.notes}")
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{booking.id}@translation-platform",
+        f"DTSTAMP:{stamp.strftime(ICAL_DATETIME_FORMAT)}",
+        f"DTSTART:{booking.start_time.strftime(ICAL_DATETIME_FORMAT)}",
+        f"DTEND:{end_time.strftime(ICAL_DATETIME_FORMAT)}",
+        f"SUMMARY:{escape_text(f'{booking.language} interpretation')}",
+        f"DESCRIPTION:{escape_text(chr(10).join(description))}",
+        f"STATUS:{ICAL_STATUS.get(booking.status, 'CONFIRMED')}",
+    ]
+    if booking.jitsi_room_name:
+        lines.append(f"LOCATION:{escape_text(booking.jitsi_room_name)}")
+    lines.append("END:VEVENT")
+
+    return "".join(fold_line(line) for line in lines)
+
+
+def generate_calendar(bookings: Iterable[Booking], calendar_name: str) -> Iterator[str]:
+    """Yield a VCALENDAR document chunk by chunk, one VEVENT per booking"""
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Translation Platform//Bookings//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(calendar_name)}",
+    ]
+    yield "".join(fold_line(line) for line in header)
+
+    for booking in bookings:
+        yield format_event(booking)
+
+    yield fold_line("END:VCALENDAR")
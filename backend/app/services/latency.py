@@ -0,0 +1,19 @@
+from typing import Iterable
+
+
+def latency_summary(samples: Iterable[float]) -> dict:
+    """Nearest-rank p50/p95/p99 and max of latency samples in milliseconds"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "samples": 0}
+
+    def rank(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {
+        "p50": rank(0.5),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": round(ordered[-1], 3),
+        "samples": len(ordered),
+    }
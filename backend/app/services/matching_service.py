@@ -0,0 +1,98 @@
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.calendar_cache import calendar_cache
+from app.services.translator_index import TranslatorInfo, translator_index
+
+
+@dataclass
+class TranslatorCandidate:
+    translator: TranslatorInfo
+    booked_minutes: int
+    score: float
+
+
+def rank_translators(
+    db: Session,
+    language: str,
+    start_time: datetime,
+    duration_minutes: int,
+    exclude: Iterable[UUID] = (),
+    limit: Optional[int] = None
+) -> List[TranslatorCandidate]:
+    """
+    Rank the free translators for a slot, best first, keeping at most limit
+
+    Candidates come from the in-memory language index and their booked
+    intervals from the calendar cache, so no users rows are scanned. Lower
+    scores win: each hour already booked that day costs MATCH_LOAD_WEIGHT and
+    each currency unit of hourly rate costs MATCH_RATE_WEIGHT. Translators
+    without a parsable rate are scored at the median rate of the candidates.
+    """
+    candidates = translator_index.candidates(db, language)
+    excluded = set(exclude)
+    if excluded:
+        candidates = [info for info in candidates if info.id not in excluded]
+    if not candidates:
+        return []
+
+    end_time = start_time + timedelta(minutes=duration_minutes)
+    day_start = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start + timedelta(days=1)
+    # The slot may cross midnight, so the window must cover it as well as the day
+    busy = calendar_cache.get_busy(
+        db,
+        [info.id for info in candidates],
+        min(day_start, start_time),
+        max(day_end, end_time)
+    )
+
+    known_rates = [info.rate_amount for info in candidates if info.rate_amount is not None]
+    default_rate = median(known_rates) if known_rates else 0.0
+    load_weight = settings.MATCH_LOAD_WEIGHT / 3600  # Per booked second
+    rate_weight = settings.MATCH_RATE_WEIGHT
+
+    scored = []
+    for info in candidates:
+        booked_seconds = 0.0
+        is_free = True
+        for start, end in busy.get(info.id, ()):
+            if start < end_time and start_time < end:
+                is_free = False
+                break
+            # Only bookings on the requested day count towards the load
+            if start < day_end and day_start < end:
+                booked_seconds += (min(end, day_end) - max(start, day_start)).total_seconds()
+        if not is_free:
+            continue
+
+        rate = info.rate_amount if info.rate_amount is not None else default_rate
+        scored.append((load_weight * booked_seconds + rate_weight * rate, info.name, booked_seconds, info))
+
+    if limit is None:
+        scored.sort(key=lambda item: item[:2])
+    else:
+        scored = heapq.nsmallest(limit, scored, key=lambda item: item[:2])
+
+    return [
+        TranslatorCandidate(info, int(booked_seconds // 60), score)
+        for score, _, booked_seconds, info in scored
+    ]
+
+
+def find_best_translator(
+    db: Session,
+    language: str,
+    start_time: datetime,
+    duration_minutes: int,
+    exclude: Iterable[UUID] = ()
+) -> Optional[TranslatorCandidate]:
+    ranked = rank_translators(db, language, start_time, duration_minutes, exclude, limit=1)
+    return ranked[0] if ranked else None
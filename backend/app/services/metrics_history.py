@@ -0,0 +1,148 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+
+class Bucket:
+    """Aggregated queue activity for one time slot"""
+    __slots__ = ("epoch", "depth_last", "depth_max", "active_last", "enqueued", "dequeued", "abandoned", "wait_sum")
+
+    def __init__(self):
+        self.reset(-1)
+
+    def reset(self, epoch: int):
+        self.epoch = epoch
+        self.depth_last = 0
+        self.depth_max = 0
+        self.active_last = 0
+        self.enqueued = 0
+        self.dequeued = 0
+        self.abandoned = 0
+        self.wait_sum = 0.0
+
+
+class RingSeries:
+    """Fixed number of buckets of one resolution; the oldest slot is reused"""
+
+    def __init__(self, resolution_seconds: int, size: int):
+        self.resolution_seconds = resolution_seconds
+        self.size = size
+        self.buckets = [Bucket() for _ in range(size)]
+
+    def bucket(self, now: float) -> Bucket:
+        epoch = int(now // self.resolution_seconds)
+        bucket = self.buckets[epoch % self.size]
+        if bucket.epoch != epoch:
+            # The slot still holds data from size buckets ago
+            bucket.reset(epoch)
+        return bucket
+
+    def retention_seconds(self) -> int:
+        return self.resolution_seconds * self.size
+
+
+class MetricsHistory:
+    """
+    In-memory time series of queue depth, waits and active calls
+
+    The queue manager records every enqueue, dequeue and abandon. Each
+    event is rolled up into per-second, per-minute and hourly ring buffers
+    at once, so the coarser resolutions are downsampled as data arrives and
+    memory is fixed by the buffer sizes whatever the uptime. Range queries
+    carry the last queue depth and active call count across slots without
+    events.
+    """
+
+    def __init__(self, second_slots: int, minute_slots: int, hour_slots: int):
+        self.series: Dict[str, RingSeries] = {
+            "second": RingSeries(1, second_slots),
+            "minute": RingSeries(60, minute_slots),
+            "hour": RingSeries(3600, hour_slots),
+        }
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        queue_depth: int,
+        active_calls: int,
+        enqueued: int = 0,
+        dequeued: int = 0,
+        abandoned: int = 0,
+        wait_seconds: float = 0.0,
+        now: Optional[float] = None
+    ):
+        """Add queue activity; wait_seconds is the summed wait of the dequeued calls"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for series in self.series.values():
+                bucket = series.bucket(now)
+                bucket.depth_last = queue_depth
+                bucket.depth_max = max(bucket.depth_max, queue_depth)
+                bucket.active_last = active_calls
+                bucket.enqueued += enqueued
+                bucket.dequeued += dequeued
+                bucket.abandoned += abandoned
+                bucket.wait_sum += wait_seconds
+
+    def query(self, resolution: str, start: float, end: float) -> List[dict]:
+        """Points from start to end (epoch seconds), one per retained slot up to now, oldest first"""
+        series = self.series[resolution]
+        step = series.resolution_seconds
+        current_epoch = int(time.time() // step)
+        end_epoch = min(int(end // step), current_epoch)
+        first_retained = current_epoch - series.size + 1
+        start_epoch = max(int(start // step), first_retained)
+
+        points = []
+        depth, active = None, None
+        with self._lock:
+            # Seed the carried values from the latest retained slot before the range
+            for epoch in range(start_epoch - 1, max(first_retained, start_epoch - series.size) - 1, -1):
+                bucket = series.buckets[epoch % series.size]
+                if bucket.epoch == epoch:
+                    depth, active = bucket.depth_last, bucket.active_last
+                    break
+
+            for epoch in range(start_epoch, end_epoch + 1):
+                bucket = series.buckets[epoch % series.size]
+                timestamp = datetime.fromtimestamp(epoch * step, tz=timezone.utc).isoformat()
+                if bucket.epoch == epoch:
+                    depth, active = bucket.depth_last, bucket.active_last
+                    points.append({
+                        "t": timestamp,
+                        "queueDepth": depth,
+                        "queueDepthMax": bucket.depth_max,
+                        "activeCalls": active,
+                        "enqueued": bucket.enqueued,
+                        "dequeued": bucket.dequeued,
+                        "abandoned": bucket.abandoned,
+                        "averageWaitSeconds": round(bucket.wait_sum / bucket.dequeued, 1) if bucket.dequeued else None,
+                    })
+                else:
+                    points.append({
+                        "t": timestamp,
+                        "queueDepth": depth,
+                        "queueDepthMax": depth,
+                        "activeCalls": active,
+                        "enqueued": 0,
+                        "dequeued": 0,
+                        "abandoned": 0,
+                        "averageWaitSeconds": None,
+                    })
+        return points
+
+    def stats(self) -> dict:
+        return {
+            resolution: {"slots": series.size, "retentionSeconds": series.retention_seconds()}
+            for resolution, series in self.series.items()
+        }
+
+
+metrics_history = MetricsHistory(
+    second_slots=settings.HISTORY_SECOND_SLOTS,
+    minute_slots=settings.HISTORY_MINUTE_SLOTS,
+    hour_slots=settings.HISTORY_HOUR_SLOTS,
+)
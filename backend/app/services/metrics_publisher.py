@@ -0,0 +1,81 @@
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.services.call_metrics import call_metrics
+from app.services.connection_manager import manager
+from app.services.periodic_task import PeriodicTask
+from app.services.queue_engine import queue_engine
+from app.services.topics import METRICS_TOPIC
+
+
+class MetricsPublisher(PeriodicTask):
+    """
+    Pushes queue metrics to websocket subscribers of the metrics topic
+
+    Metrics are computed once per tick, independent of the number of
+    viewers, and only the fields that changed since the previous tick are
+    sent as a metrics_delta. Every delta carries a sequence number; a client
+    that reconnects or sees a gap asks for a metrics_snapshot. Each worker
+    pushes to its own sockets, since counters are kept per worker.
+    """
+
+    def __init__(self, interval_seconds: float):
+        super().__init__(interval_seconds)
+        self.sequence = 0
+        self.current: dict = {}
+        self.ticks = 0
+        self.deltas_sent = 0
+        self.last_tick_ms: Optional[float] = None
+
+    def compute(self) -> dict:
+        metrics = call_metrics.snapshot()
+        metrics["queueLength"] = len(queue_engine)
+        metrics["queueByLanguage"] = {
+            language: queue_engine.length(language) for language in queue_engine.languages()
+        }
+        return metrics
+
+    async def tick(self):
+        started_at = time.perf_counter()
+        metrics = self.compute()
+        changes = {key: value for key, value in metrics.items() if self.current.get(key) != value}
+        removed = [key for key in self.current if key not in metrics]
+        self.current = metrics
+        self.ticks += 1
+
+        if changes or removed:
+            self.sequence += 1
+            self.deltas_sent += 1
+            data = {"seq": self.sequence, "changes": changes}
+            if removed:
+                data["removed"] = removed
+            await manager.broadcast(
+                {"type": "metrics_delta", "data": data},
+                topics=[METRICS_TOPIC],
+                local=True
+            )
+        self.last_tick_ms = round((time.perf_counter() - started_at) * 1000, 3)
+
+    def snapshot_message(self) -> dict:
+        """Full metrics for a client (re)joining the delta stream"""
+        if not self.current:
+            self.current = self.compute()
+        return {"type": "metrics_snapshot", "data": {"seq": self.sequence, "metrics": self.current}}
+
+    async def run_once(self):
+        await self.tick()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "intervalSeconds": self.interval_seconds,
+            "ticks": self.ticks,
+            "deltasSent": self.deltas_sent,
+            "sequence": self.sequence,
+            "lastTickMs": self.last_tick_ms,
+            "subscribers": len(manager.subscribers.get(METRICS_TOPIC, ())),
+        }
+
+
+metrics_publisher = MetricsPublisher(interval_seconds=settings.METRICS_PUSH_INTERVAL_SECONDS)
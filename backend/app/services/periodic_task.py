@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask(ABC):
+    """
+    Lifespan-managed asyncio task calling run_once in a loop
+
+    Between passes the loop awaits wait(), which sleeps interval_seconds
+    unless a subclass wakes up on events. A failing pass is logged and the
+    loop carries on.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def run_once(self):
+        """One pass of the background work"""
+
+    async def wait(self):
+        await asyncio.sleep(self.interval_seconds)
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("%s pass failed", type(self).__name__)
+            await self.wait()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,227 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.queue import QueueItem
+
+
+@dataclass(frozen=True)
+class QueueEntry:
+    call_id: UUID
+    priority: int
+    sequence: int
+    language: str
+
+    @property
+    def sort_key(self) -> Tuple[int, int]:
+        return (-self.priority, self.sequence)
+
+
+@dataclass
+class LanguagePool:
+    """Waiting calls of one language: dequeue heap and per-priority sequences"""
+    heap: List[Tuple[int, int, UUID]] = field(default_factory=list)
+    sequences_by_priority: Dict[int, List[int]] = field(default_factory=dict)
+    size: int = 0
+
+
+class QueueEngine:
+    """
+    In-memory mirror of the queue table ordered by (priority DESC, sequence)
+
+    Calls are routed per language, so every language has its own pool with a
+    binary heap (lazy deletion) for dequeue order and per-priority sorted
+    sequence lists. Sequences only grow, so an enqueue is a bisect plus an
+    append, O(log n). A dequeue is an O(log n) heap pop plus deleting the
+    sequence from its sorted list, an O(n) memmove over the caller's
+    language pool. Positions are derived within that pool by bisecting and
+    adding the sizes of higher priorities. The queue table stays the source
+    of truth; the mirror is rebuilt from it at startup and re-synced
+    periodically to drop calls dequeued through other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[UUID, QueueEntry] = {}
+        self._pools: Dict[str, LanguagePool] = {}
+        # Pushes and removes made while rebuild reads the table, replayed onto the result
+        self._journal: Optional[List[Tuple[bool, QueueEntry]]] = None
+        self.resyncs = 0
+        self.last_drift: Optional[dict] = None
+
+    def rebuild(self, db: Session) -> Set[UUID]:
+        """Reload the mirror from the queue table, returning the call ids it dropped"""
+        with self._lock:
+            self._journal = []
+        try:
+            rows = db.query(QueueItem.call_id, QueueItem.priority, QueueItem.sequence, QueueItem.language).all()
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            journal, self._journal = self._journal, None
+            previous = self._entries
+            self._entries = {}
+            self._pools = {}
+            for call_id, priority, sequence, language in rows:
+                entry = QueueEntry(call_id, priority or 0, sequence, language)
+                self._add(entry)
+                self._pools[language].heap.append((*entry.sort_key, call_id))
+            for pool in self._pools.values():
+                heapq.heapify(pool.heap)
+
+            for pushed, entry in journal:
+                if pushed:
+                    self._push(entry)
+                else:
+                    self._remove(entry.call_id)
+
+            dropped = previous.keys() - self._entries.keys()
+            added = self._entries.keys() - previous.keys()
+            self.resyncs += 1
+            self.last_drift = {"dropped": len(dropped), "added": len(added)}
+            return set(dropped)
+
+    def push(self, call_id: UUID, priority: int, sequence: int, language: str):
+        entry = QueueEntry(call_id, priority or 0, sequence, language)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((True, entry))
+            self._push(entry)
+
+    def remove(self, call_id: UUID) -> bool:
+        """Drop a call; its heap slot is discarded lazily on the next pop"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((False, QueueEntry(call_id, 0, 0, "")))
+            return self._remove(call_id)
+
+    def peek(self, language: Optional[str] = None) -> Optional[QueueEntry]:
+        """Head of a language pool, or of the whole queue if language is None"""
+        with self._lock:
+            head = self._head(language)
+            return self._entries[head[2]] if head else None
+
+    def pop(self, language: Optional[str] = None) -> Optional[QueueEntry]:
+        with self._lock:
+            head = self._head(language)
+            if head is None:
+                return None
+            entry = self._entries.pop(head[2])
+            heapq.heappop(self._pools[entry.language].heap)
+            self._unlink(entry)
+            return entry
+
+    def get(self, call_id: UUID) -> Optional[QueueEntry]:
+        return self._entries.get(call_id)
+
+    def position(self, call_id: UUID) -> Optional[int]:
+        """1-based position of a call within its language pool"""
+        with self._lock:
+            entry = self._entries.get(call_id)
+            if entry is None:
+                return None
+            sequences_by_priority = self._pools[entry.language].sequences_by_priority
+            ahead = sum(
+                len(sequences)
+                for priority, sequences in sequences_by_priority.items()
+                if priority > entry.priority
+            )
+            ahead += bisect_left(sequences_by_priority[entry.priority], entry.sequence)
+            return ahead + 1
+
+    def ordered(self, language: Optional[str] = None) -> List[QueueEntry]:
+        """Waiting calls in dequeue order, for one language or all"""
+        with self._lock:
+            entries = [
+                entry for entry in self._entries.values()
+                if language is None or entry.language == language
+            ]
+        return sorted(entries, key=lambda entry: entry.sort_key)
+
+    def languages(self) -> List[str]:
+        """Languages with waiting calls, the one with the most urgent head first"""
+        with self._lock:
+            heads = [
+                (head[:2], language)
+                for language, head in ((language, self._head(language)) for language in list(self._pools))
+                if head is not None
+            ]
+        return [language for _, language in sorted(heads)]
+
+    def length(self, language: Optional[str] = None) -> int:
+        if language is None:
+            return len(self._entries)
+        pool = self._pools.get(language)
+        return pool.size if pool else 0
+
+    def stats(self) -> dict:
+        return {
+            "length": len(self._entries),
+            "languages": len(self._pools),
+            "resyncs": self.resyncs,
+            "lastDrift": self.last_drift,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, call_id: UUID) -> bool:
+        return call_id in self._entries
+
+    def _push(self, entry: QueueEntry):
+        if entry.call_id in self._entries:
+            return
+        self._add(entry)
+        heapq.heappush(self._pools[entry.language].heap, (*entry.sort_key, entry.call_id))
+
+    def _remove(self, call_id: UUID) -> bool:
+        entry = self._entries.pop(call_id, None)
+        if entry is None:
+            return False
+        self._unlink(entry)
+        return True
+
+    def _add(self, entry: QueueEntry):
+        self._entries[entry.call_id] = entry
+        pool = self._pools.setdefault(entry.language, LanguagePool())
+        insort(pool.sequences_by_priority.setdefault(entry.priority, []), entry.sequence)
+        pool.size += 1
+
+    def _unlink(self, entry: QueueEntry):
+        pool = self._pools[entry.language]
+        sequences = pool.sequences_by_priority[entry.priority]
+        del sequences[bisect_left(sequences, entry.sequence)]
+        if not sequences:
+            del pool.sequences_by_priority[entry.priority]
+        pool.size -= 1
+
+    def _head(self, language: Optional[str]) -> Optional[Tuple[int, int, UUID]]:
+        if language is None:
+            heads = [self._head(language) for language in list(self._pools)]
+            heads = [head for head in heads if head is not None]
+            return min(heads) if heads else None
+
+        pool = self._pools.get(language)
+        if pool is None:
+            return None
+        # Drop heap slots of removed calls, or of calls re-queued with a new sequence
+        while pool.heap:
+            _, sequence, call_id = pool.heap[0]
+            entry = self._entries.get(call_id)
+            if entry is not None and entry.sequence == sequence:
+                return pool.heap[0]
+            heapq.heappop(pool.heap)
+        if pool.size == 0:
+            del self._pools[language]
+        return None
+
+
+queue_engine = QueueEngine()
@@ -1,94 +1,336 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import column, delete, inspect, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from dataclasses import dataclass, field
 from uuid import UUID
 from datetime import datetime
+import time
 
 from app.models.call import Call, CallStatus
 from app.models.queue import QueueItem
-from app.models.user import User, UserRole
+from app.models.user import AgentState, User
+from app.services.agent_registry import AGENT_STATE_BY_CALL_STATUS, agent_registry
+from app.services.call_metrics import call_metrics
+from app.services.metrics_history import metrics_history
+from app.services.queue_engine import queue_engine
+from app.services.wait_estimator import wait_estimator
+
+def previous_value(instance, attribute: str):
+    """Value an attribute had when loaded, before the pending change"""
+    history = inspect(instance).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return history.unchanged[0] if history.unchanged else None
+
+@dataclass
+class AssignmentRound:
+    assignments: list[tuple[UUID, UUID]] = field(default_factory=list)  # (call_id, agent_id)
+    latency_ms: float = 0.0
 
 class QueueManager:
     def __init__(self, db: Session):
         self.db = db
 
-    def add_to_queue(self, call_id: UUID, priority: int = 0) -> QueueItem:
-        """Add a call to the queue"""
-        max_position = self.db.query(QueueItem).count()
-
+    def add_to_queue(self, call_id: UUID, language: str, priority: int = 0) -> QueueItem:
+        """Add a call to its language's queue; the enqueue sequence comes from the database"""
         queue_item = QueueItem(
             call_id=call_id,
-            position=max_position + 1,
+            language=language,
             priority=priority
         )
         self.db.add(queue_item)
         self.db.commit()
         self.db.refresh(queue_item)
-        return queue_item
 
-    def remove_from_queue(self, call_id: UUID):
-        """Remove a call from the queue"""
-        queue_item = self.db.query(QueueItem).filter(
-            QueueItem.call_id == call_id
-        ).first()
+        queue_engine.push(queue_item.call_id, queue_item.priority, queue_item.sequence, queue_item.language)
+        wait_estimator.record_enqueued(queue_item.call_id, queue_item.priority, queue_item.language)
+        self._record_history(enqueued=1)
+        return queue_item
 
-        if queue_item:
-            position = queue_item.position
-            self.db.delete(queue_item)
+    def remove_from_queue(self, call_id: UUID, commit: bool = True) -> bool:
+        """Remove an abandoned call from the queue; without commit, call forget_removed once committed"""
+        removed = self.db.execute(
+            delete(QueueItem)
+            .where(QueueItem.call_id == call_id)
+            .execution_options(synchronize_session=False)
+        ).rowcount > 0
+        if commit:
+            self.db.commit()
+            self.forget_removed(call_id)
+        return removed
 
-            # Update positions of remaining items
-            self.db.query(QueueItem).filter(
-                QueueItem.position > position
-            ).update({"position": QueueItem.position - 1})
+    def forget_removed(self, call_id: UUID):
+        """Drop a committed queue removal from the in-memory queue and stats"""
+        queue_engine.remove(call_id)
+        wait_estimator.record_abandoned(call_id)
+        self._record_history(abandoned=1)
 
-            self.db.commit()
+    def get_position(self, call_id: UUID) -> int | None:
+        """1-based position of a waiting call"""
+        return queue_engine.position(call_id)
 
-    def get_next_call(self) -> Call | None:
-        """Get the next call in the queue based on priority and position"""
-        queue_item = self.db.query(QueueItem).order_by(
-            QueueItem.priority.desc(),
-            QueueItem.created_at
-        ).first()
+    def get_next_call(self, language: str | None = None) -> Call | None:
+        """Get the next call based on priority and enqueue order, optionally for one language"""
+        entry = queue_engine.peek(language)
 
-        if queue_item:
-            call = self.db.query(Call).filter(Call.id == queue_item.call_id).first()
-            return call
+        if entry:
+            return self.db.query(Call).filter(Call.id == entry.call_id).first()
 
         return None
 
+    def claim_next_call(self, agent_id: UUID, languages: list[str] | None = None) -> Call | None:
+        """Take the head of the queue with SKIP LOCKED and ring the agent, optionally within languages"""
+        query = self.db.query(QueueItem)
+        if languages is not None:
+            query = query.filter(QueueItem.language.in_(languages))
+
+        call = None
+        while call is None:
+            queue_item = query.order_by(
+                QueueItem.priority.desc(),
+                QueueItem.sequence
+            ).with_for_update(skip_locked=True).first()
+
+            if not queue_item:
+                self.db.rollback()
+                return None
+
+            try:
+                # None when the head was a stale row of a call that is no longer waiting
+                call = self._ring_agent(queue_item, agent_id)
+            except ValueError:
+                return None  # The agent was taken through another worker
+
+        queue_engine.remove(call.id)
+        self._record_history(dequeued=1, wait_seconds=wait_estimator.record_dequeued(call.id) or 0.0)
+        return call
+
     def assign_call_to_agent(self, call_id: UUID, agent_id: UUID) -> Call:
-        """Assign a call to an available agent"""
-        call = self.db.query(Call).filter(Call.id == call_id).first()
+        """Assign a specific queued call to an available agent"""
+        queue_item = self.db.query(QueueItem).filter(
+            QueueItem.call_id == call_id
+        ).with_for_update(skip_locked=True).first()
+
+        if not queue_item:
+            self.db.rollback()
+            raise ValueError("Call is not waiting in the queue")
+
+        call = self._ring_agent(queue_item, agent_id)
+        if call is None:
+            raise ValueError("Call is not waiting in the queue")
+        queue_engine.remove(call.id)
+        self._record_history(dequeued=1, wait_seconds=wait_estimator.record_dequeued(call.id) or 0.0)
+        return call
+
+    def _ring_agent(self, queue_item: QueueItem, agent_id: UUID) -> Call | None:
+        """Ring the agent for a locked queue row; None if the call stopped waiting, ValueError if the agent is busy"""
+        call = self.db.query(Call).filter(Call.id == queue_item.call_id).first()
+        if call is None or call.status != CallStatus.WAITING:
+            self.db.delete(queue_item)
+            self.db.commit()
+            self.forget_removed(queue_item.call_id)
+            return None
 
-        if not call:
-            raise ValueError("Call not found")
+        if not self._claim_agents([agent_id]):
+            self.db.rollback()
+            agent_registry.invalidate()
+            raise ValueError("Agent is not available")
+
+        # Flushed first, so the transition does not count the call as abandoned
+        self.db.delete(queue_item)
+        self.db.flush()
 
         call.agent_id = agent_id
         call.status = CallStatus.RINGING
         call.start_time = datetime.utcnow()
 
-        self.remove_from_queue(call_id)
-
-        self.db.commit()
+        self.commit_call_transition(call)
         self.db.refresh(call)
         return call
 
-    def get_available_agents(self) -> list[User]:
-        """Get list of agents that are not currently on a call"""
-        busy_agent_ids = self.db.query(Call.agent_id).filter(
-            Call.status.in_([CallStatus.ACTIVE, CallStatus.RINGING])
-        ).distinct()
+    def update_agent_state(self, agent_id: UUID, state: AgentState) -> bool:
+        """Switch an agent that is not on a call to IDLE or OFFLINE; False if a call got there first"""
+        updated = self.db.execute(
+            update(User)
+            .where(User.id == agent_id, User.agent_state.in_([AgentState.IDLE, AgentState.OFFLINE]))
+            .values(agent_state=state)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if updated is None:
+            self.db.rollback()
+            agent_registry.invalidate()
+            return False
+        self.db.commit()
+        agent_registry.set_state(agent_id, state)
+        return True
+
+    def commit_call_transition(self, call: Call, previous_agent_id: UUID | None = None):
+        """Commit a call change with the agent states, queue removal and metrics it implies"""
+        call_id, language, call_status, duration = call.id, call.language, call.status, call.duration
+        old_status = previous_value(call, "status")
+        old_duration = previous_value(call, "duration")
+
+        # A call leaving WAITING other than by ringing (hang-up, MISSED, ENDED) leaves the queue.
+        # The queue row is deleted before the call row is written, in the same lock order as a claim.
+        left_queue = False
+        if old_status == CallStatus.WAITING and call_status != CallStatus.WAITING:
+            with self.db.no_autoflush:
+                left_queue = self.remove_from_queue(call_id, commit=False)
 
-        available_agents = self.db.query(User).filter(
-            User.role == UserRole.AGENT,
-            ~User.id.in_(busy_agent_ids)
-        ).all()
+        states = {}
+        if previous_agent_id is not None and previous_agent_id != call.agent_id:
+            states[previous_agent_id] = AgentState.IDLE
+        if call.agent_id is not None:
+            states[call.agent_id] = AGENT_STATE_BY_CALL_STATUS[call.status]
 
-        return available_agents
+        for agent_id, state in states.items():
+            self.db.execute(
+                update(User)
+                .where(User.id == agent_id)
+                .values(agent_state=state)
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+
+        for agent_id, state in states.items():
+            agent_registry.set_state(agent_id, state)
+        if left_queue:
+            self.forget_removed(call_id)
+        if old_status is not None:  # Unloaded history is left to the next reconcile
+            call_metrics.record_transition(old_status, call_status, old_duration, duration)
+            if CallStatus.ACTIVE in (old_status, call_status) and old_status != call_status:
+                self._record_history()
+        if call_status in (CallStatus.ENDED, CallStatus.MISSED):
+            wait_estimator.record_handled(call_id, language, duration if call_status == CallStatus.ENDED else None)
+
+    def _record_history(self, **activity):
+        """Feed queue activity and the current gauges into the metrics history"""
+        metrics_history.record(len(queue_engine), call_metrics.count(CallStatus.ACTIVE), **activity)
+
+    def get_available_agents(self, skill: str | None = None, limit: int | None = None) -> list[UUID]:
+        """Idle agents, longest idle first, from the in-memory occupancy index"""
+        return agent_registry.idle_agents(self.db, skill=skill, limit=limit)
 
-    def auto_assign_calls(self):
-        """Automatically assign waiting calls to available agents"""
-        available_agents = self.get_available_agents()
+    def plan_round(self) -> list[tuple[str, list[UUID]]]:
+        """Pick idle agents for every language pool, most urgent language first, each agent used once"""
+        taken: set[UUID] = set()
+        plan = []
+        for language in queue_engine.languages():
+            waiting = queue_engine.length(language)
+            candidates = self.get_available_agents(skill=language, limit=waiting + len(taken))
+            agent_ids = [agent_id for agent_id in candidates if agent_id not in taken][:waiting]
+            if agent_ids:
+                taken.update(agent_ids)
+                plan.append((language, agent_ids))
+        return plan
+
+    def _claim_agents(self, agent_ids: list[UUID]) -> set[UUID]:
+        """Move the agents that are still idle to RINGING, without committing; returns those claimed"""
+        return set(self.db.execute(
+            update(User)
+            .where(User.id.in_(agent_ids), User.agent_state == AgentState.IDLE)
+            .values(agent_state=AgentState.RINGING)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+
+    def _claim_language_batch(self, language: str, agent_ids: list[UUID]) -> list[tuple]:
+        """Lock the head of a language pool and claim idle agents for it, without committing"""
+        queue_rows = self.db.query(QueueItem.id, QueueItem.call_id).filter(
+            QueueItem.language == language
+        ).order_by(
+            QueueItem.priority.desc(),
+            QueueItem.sequence
+        ).limit(len(agent_ids)).with_for_update(skip_locked=True).all()
 
-        for agent in available_agents:
-            next_call = self.get_next_call()
-            if next_call:
-                self.assign_call_to_agent(next_call.id, agent.id)
+        if not queue_rows:
+            return []
+
+        claimed = self._claim_agents(agent_ids[:len(queue_rows)])
+        ringing_agents = [agent_id for agent_id in agent_ids[:len(queue_rows)] if agent_id in claimed]
+        if len(ringing_agents) < len(queue_rows):
+            # Some agents were taken through another worker
+            agent_registry.invalidate()
+
+        return list(zip(queue_rows, ringing_agents))
+
+    def assign_batch(self, plan: list[tuple[str, list[UUID]]]) -> list[tuple[UUID, UUID]]:
+        """Ring the heads of the language pools with the planned agents in one transaction"""
+        pairs = []
+        for language, agent_ids in plan:
+            pairs.extend(self._claim_language_batch(language, agent_ids))
+
+        if not pairs:
+            self.db.rollback()
+            return []
+
+        assignment_values = values(
+            column("call_id", PGUUID(as_uuid=True)),
+            column("agent_id", PGUUID(as_uuid=True)),
+            name="assignment"
+        ).data([(row.call_id, agent_id) for row, agent_id in pairs])
+
+        rung = set(self.db.execute(
+            update(Call)
+            .where(Call.id == assignment_values.c.call_id, Call.status == CallStatus.WAITING)
+            .values(
+                agent_id=assignment_values.c.agent_id,
+                status=CallStatus.RINGING,
+                start_time=datetime.utcnow(),
+                version=Call.version + 1
+            )
+            .returning(Call.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+        assignments = [(row.call_id, agent_id) for row, agent_id in pairs if row.call_id in rung]
+        released = [agent_id for row, agent_id in pairs if row.call_id not in rung]
+        if released:
+            # Stale queue rows of calls that are no longer waiting; their agents stay idle
+            self.db.execute(
+                update(User)
+                .where(User.id.in_(released))
+                .values(agent_state=AgentState.IDLE)
+                .execution_options(synchronize_session=False)
+            )
+        self.db.execute(
+            delete(QueueItem)
+            .where(QueueItem.id.in_([row.id for row, _ in pairs]))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+        call_metrics.record_transition(CallStatus.WAITING, CallStatus.RINGING, count=len(assignments))
+        wait_sum = 0.0
+        for call_id, agent_id in assignments:
+            queue_engine.remove(call_id)
+            wait_sum += wait_estimator.record_dequeued(call_id) or 0.0
+            agent_registry.set_state(agent_id, AgentState.RINGING)
+        for row, agent_id in pairs:
+            if row.call_id not in rung:
+                queue_engine.remove(row.call_id)
+                wait_estimator.record_abandoned(row.call_id)
+                agent_registry.set_state(agent_id, AgentState.IDLE)
+        self._record_history(dequeued=len(assignments), wait_seconds=wait_sum)
+        return assignments
+
+    def auto_assign_calls(self, batched: bool = True) -> AssignmentRound:
+        """Automatically assign waiting calls to available agents, batched or one call per agent"""
+        started_at = time.perf_counter()
+        plan = self.plan_round()
+
+        if batched:
+            assignments = self.assign_batch(plan)
+        else:
+            assignments = []
+            for language, agent_ids in plan:
+                for agent_id in agent_ids:
+                    call = self.claim_next_call(agent_id, [language])
+                    if call is None:
+                        break
+                    assignments.append((call.id, agent_id))
+
+        return AssignmentRound(
+            assignments=assignments,
+            latency_ms=round((time.perf_counter() - started_at) * 1000, 2)
+        )
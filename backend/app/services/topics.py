@@ -0,0 +1,52 @@
+from typing import List
+from uuid import UUID
+
+from app.models.user import User, UserRole
+
+# Call center queue events such as assignments
+QUEUE_TOPIC = "queue"
+
+# Pushed queue metric deltas for dashboards
+METRICS_TOPIC = "metrics"
+
+
+def company_topic(company_id: UUID) -> str:
+    return f"company:{company_id}"
+
+
+def translator_topic(translator_id: UUID) -> str:
+    return f"translator:{translator_id}"
+
+
+def agent_topic(agent_id: UUID) -> str:
+    return f"agent:{agent_id}"
+
+
+def default_topics(user: User) -> List[str]:
+    """Topics a client is subscribed to right after connecting"""
+    if user.role == UserRole.AGENT:
+        return [QUEUE_TOPIC, agent_topic(user.id)]
+    if user.role in (UserRole.SUPERVISOR, UserRole.ADMIN):
+        return [QUEUE_TOPIC, METRICS_TOPIC]
+    if user.role == UserRole.TRANSLATOR:
+        return [translator_topic(user.id)]
+    if user.company_id is not None:
+        return [company_topic(user.company_id)]
+    return []
+
+
+def can_subscribe(user: User, topic: str) -> bool:
+    """Whether the user may receive the events of a topic"""
+    if user.role == UserRole.ADMIN:
+        return True
+
+    kind, _, key = topic.partition(":")
+    if kind in (QUEUE_TOPIC, METRICS_TOPIC) and not key:
+        return user.role in (UserRole.AGENT, UserRole.SUPERVISOR)
+    if kind == "agent":
+        return key == str(user.id) or user.role == UserRole.SUPERVISOR
+    if kind == "translator":
+        return key == str(user.id)
+    if kind == "company":
+        return user.company_id is not None and key == str(user.company_id)
+    return False
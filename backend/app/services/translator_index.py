@@ -0,0 +1,136 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+RATE_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_hourly_rate(hourly_rate: Optional[str]) -> Optional[float]:
+    """Extract the numeric amount from a free-form rate such as "$50/hour" """
+    if not hourly_rate:
+        return None
+    match = RATE_PATTERN.search(hourly_rate.replace(",", ""))
+    return float(match.group()) if match else None
+
+
+@dataclass(frozen=True)
+class TranslatorInfo:
+    id: UUID
+    email: str
+    name: str
+    languages: Tuple[str, ...]
+    is_available: bool
+    hourly_rate: Optional[str]
+    rate_amount: Optional[float]
+
+
+class TranslatorIndex:
+    """
+    In-process inverted index language -> translators
+
+    Loaded from the users table with a single query. The translator write
+    endpoints keep it current through upsert(), and it is reloaded after a
+    TTL so changes made through other workers are eventually picked up.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._by_id: Dict[UUID, TranslatorInfo] = {}
+        self._by_language: Dict[str, Set[UUID]] = defaultdict(set)
+        # Name-ordered lists per language (None for all), rebuilt lazily after changes
+        self._language_lists: Dict[Optional[str], Tuple[TranslatorInfo, ...]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        """Rebuild the index from the database"""
+        rows = db.query(
+            User.id,
+            User.email,
+            User.name,
+            User.languages,
+            User.is_available,
+            User.hourly_rate
+        ).filter(User.role == UserRole.TRANSLATOR).all()
+
+        by_id = {}
+        by_language = defaultdict(set)
+        for row in rows:
+            info = self._make_info(row)
+            by_id[info.id] = info
+            for language in info.languages:
+                by_language[language].add(info.id)
+
+        with self._lock:
+            self._by_id = by_id
+            self._by_language = by_language
+            self._language_lists = {}
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+            self.load(db)
+
+    def upsert(self, user: User):
+        """Add or refresh a translator after it was created or updated"""
+        if self._loaded_at is None:
+            return  # Picked up by the first load
+
+        with self._lock:
+            previous = self._by_id.pop(user.id, None)
+            if previous is not None:
+                for language in previous.languages:
+                    self._by_language[language].discard(user.id)
+
+            if user.role == UserRole.TRANSLATOR:
+                info = self._make_info(user)
+                self._by_id[info.id] = info
+                for language in info.languages:
+                    self._by_language[language].add(info.id)
+
+            self._language_lists = {}
+
+    def candidates(
+        self,
+        db: Session,
+        language: Optional[str] = None,
+        available_only: bool = True
+    ) -> List[TranslatorInfo]:
+        """Translators speaking the language (all if None), without touching the users table"""
+        self.ensure_loaded(db)
+        with self._lock:
+            infos = self._language_lists.get(language)
+            if infos is None:
+                if language is None:
+                    members = self._by_id.values()
+                else:
+                    members = [self._by_id[translator_id] for translator_id in self._by_language.get(language, ())]
+                infos = tuple(sorted(members, key=lambda info: info.name))
+                self._language_lists[language] = infos
+        if available_only:
+            return [info for info in infos if info.is_available]
+        return list(infos)
+
+    @staticmethod
+    def _make_info(user) -> TranslatorInfo:
+        return TranslatorInfo(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            languages=tuple(user.languages or ()),
+            is_available=bool(user.is_available),
+            hourly_rate=user.hourly_rate,
+            rate_amount=parse_hourly_rate(user.hourly_rate),
+        )
+
+
+translator_index = TranslatorIndex(ttl_seconds=settings.TRANSLATOR_INDEX_TTL_SECONDS)
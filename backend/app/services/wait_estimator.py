@@ -0,0 +1,198 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from calendar import timegm
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.queue import QueueItem
+from app.services.queue_engine import queue_engine
+
+StatsKey = Tuple[int, str]  # (priority, language)
+
+# Recent dequeues needed before the dequeue rate is trusted for ETAs
+MIN_RATE_SAMPLES = 5
+
+# Calls rung longer ago than this are assumed to have ended without record_handled
+ASSIGNED_MAX_AGE_SECONDS = 12 * 3600
+
+
+@dataclass
+class DecayedAverage:
+    """Exponentially time-decayed mean and event rate, updated in O(1)"""
+    weighted_sum: float = 0.0
+    weight: float = 0.0
+    updated_at: Optional[float] = None
+    first_at: Optional[float] = None
+
+    def _decay(self, now: float, tau: float):
+        if self.updated_at is not None:
+            factor = math.exp(-(now - self.updated_at) / tau)
+            self.weighted_sum *= factor
+            self.weight *= factor
+        self.updated_at = now
+
+    def add(self, value: float, now: float, tau: float):
+        if self.first_at is None:
+            self.first_at = now
+        self._decay(now, tau)
+        self.weighted_sum += value
+        self.weight += 1.0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.weighted_sum / self.weight if self.weight > 0 else None
+
+    def rate(self, now: float, tau: float) -> float:
+        """Events per second over the decayed window
+
+        Divides by the window actually observed, so the rate is not
+        underestimated while the first time constant is filling up.
+        """
+        if self.updated_at is None or now <= self.first_at:
+            return 0.0
+        window = tau * (1 - math.exp(-(now - self.first_at) / tau))
+        return self.weight * math.exp(-(now - self.updated_at) / tau) / window
+
+
+class WaitEstimator:
+    """
+    Rolling wait and handle time statistics for queue position and ETA
+
+    Waits are measured from enqueue to ringing and handle times from the
+    call's duration, both as exponentially decayed averages per (priority,
+    language) with a configurable half-life. The same decayed window gives
+    the dequeue rate per language. A call's ETA is its position in the
+    language pool divided by that rate, falling back to the average wait of
+    its priority and language while too few calls were dequeued. All
+    updates and estimates are O(1); the calls table is never scanned.
+    """
+
+    def __init__(self, half_life_seconds: float):
+        self.tau = half_life_seconds / math.log(2)
+        self._lock = threading.Lock()
+        self._enqueued: Dict[UUID, Tuple[float, StatsKey]] = {}
+        self._assigned: OrderedDict[UUID, Tuple[float, StatsKey]] = OrderedDict()
+        self._wait: Dict[StatsKey, DecayedAverage] = {}
+        self._handle: Dict[StatsKey, DecayedAverage] = {}
+        self._dequeues: Dict[str, DecayedAverage] = {}
+        self._overall_wait = DecayedAverage()
+        self._overall_handle = DecayedAverage()
+
+    def rebuild(self, db: Session):
+        """Track the calls already waiting, using their enqueue time"""
+        rows = db.query(QueueItem.call_id, QueueItem.priority, QueueItem.language, QueueItem.created_at).all()
+        with self._lock:
+            self._enqueued = {
+                call_id: (timegm(created_at.timetuple()) if created_at else time.time(), (priority or 0, language))
+                for call_id, priority, language, created_at in rows
+            }
+
+    def record_enqueued(self, call_id: UUID, priority: int, language: str):
+        with self._lock:
+            self._enqueued[call_id] = (time.time(), (priority or 0, language))
+
+    def record_dequeued(self, call_id: UUID) -> Optional[float]:
+        """A waiting call started ringing an agent; returns its wait in seconds if known"""
+        now = time.time()
+        with self._lock:
+            enqueued = self._enqueued.pop(call_id, None)
+            if enqueued is None:
+                return None
+            enqueued_at, key = enqueued
+            wait = max(0.0, now - enqueued_at)
+            self._wait.setdefault(key, DecayedAverage()).add(wait, now, self.tau)
+            self._overall_wait.add(wait, now, self.tau)
+            self._dequeues.setdefault(key[1], DecayedAverage()).add(1.0, now, self.tau)
+            self._assigned[call_id] = (now, key)
+            # Insertion order is ring order, so expired entries are at the front
+            while self._assigned and next(iter(self._assigned.values()))[0] < now - ASSIGNED_MAX_AGE_SECONDS:
+                self._assigned.popitem(last=False)
+            return wait
+
+    def record_abandoned(self, call_id: UUID):
+        with self._lock:
+            self._enqueued.pop(call_id, None)
+
+    def record_handled(self, call_id: UUID, language: str, duration_seconds: Optional[int]):
+        """A call ended after being handled for duration_seconds"""
+        now = time.time()
+        with self._lock:
+            _, key = self._assigned.pop(call_id, (now, (0, language)))
+            if duration_seconds is None:
+                return
+            self._handle.setdefault(key, DecayedAverage()).add(duration_seconds, now, self.tau)
+            self._overall_handle.add(duration_seconds, now, self.tau)
+
+    def average_wait_seconds(self) -> Optional[float]:
+        return self._overall_wait.mean
+
+    def average_handle_seconds(self) -> Optional[float]:
+        return self._overall_handle.mean
+
+    def estimate(self, call_id: UUID) -> Optional[dict]:
+        """Position within the call's language pool and estimated seconds until ringing"""
+        entry = queue_engine.get(call_id)
+        position = queue_engine.position(call_id)
+        if entry is None or position is None:
+            return None
+
+        now = time.time()
+        key = (entry.priority, entry.language)
+        with self._lock:
+            enqueued = self._enqueued.get(call_id)
+            waited = max(0.0, now - enqueued[0]) if enqueued else None
+            dequeues = self._dequeues.get(entry.language)
+            rate = dequeues.rate(now, self.tau) if dequeues and dequeues.weight >= MIN_RATE_SAMPLES else 0.0
+            wait = self._wait.get(key)
+            handle = self._handle.get(key)
+
+            if rate > 0:
+                eta = position / rate
+            elif wait is not None and wait.mean is not None:
+                eta = max(0.0, wait.mean - (waited or 0.0))
+            else:
+                eta = None
+
+        return {
+            "call_id": call_id,
+            "language": entry.language,
+            "priority": entry.priority,
+            "position": position,
+            "queue_length": queue_engine.length(entry.language),
+            "waited_seconds": round(waited, 1) if waited is not None else None,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "average_wait_seconds": round(wait.mean, 1) if wait and wait.mean is not None else None,
+            "average_handle_seconds": round(handle.mean, 1) if handle and handle.mean is not None else None,
+        }
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                "halfLifeSeconds": round(self.tau * math.log(2), 1),
+                "tracked": len(self._enqueued),
+                "trackedAssigned": len(self._assigned),
+                "averageWaitSeconds": self._overall_wait.mean,
+                "averageHandleSeconds": self._overall_handle.mean,
+                "dequeuesPerMinute": {
+                    language: round(average.rate(now, self.tau) * 60, 3)
+                    for language, average in self._dequeues.items()
+                },
+                "waitByPriorityLanguage": {
+                    f"{priority}:{language}": round(average.mean, 1)
+                    for (priority, language), average in self._wait.items() if average.mean is not None
+                },
+                "handleByPriorityLanguage": {
+                    f"{priority}:{language}": round(average.mean, 1)
+                    for (priority, language), average in self._handle.items() if average.mean is not None
+                },
+            }
+
+
+wait_estimator = WaitEstimator(half_life_seconds=settings.ESTIMATOR_HALF_LIFE_SECONDS)
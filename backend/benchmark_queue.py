@@ -0,0 +1,165 @@
+"""
+Queue benchmarks
+
+engine:   in-memory enqueue, position lookup and per-language dequeue
+          throughput with a large number of waiting calls. No database is
+          needed.
+dispatch: concurrent claim stress test against DATABASE_URL. Several
+          IDLE agents claim calls with QueueManager.claim_next_call, going
+          back to IDLE after each ring, and the run fails if any call is
+          handed out twice. Test rows are removed
+          afterwards.
+
+Run: python benchmark_queue.py engine [--calls 10000]
+     python benchmark_queue.py dispatch [--calls 2000] [--workers 8]
+"""
+import argparse
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from app.services.queue_engine import QueueEngine
+
+LANGUAGES = ["SPANISH", "FRENCH", "GERMAN"]
+
+
+def timed(label: str, operations: int, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {operations:>8} ops  {elapsed * 1000:>9.1f} ms  {operations / elapsed:>12,.0f} ops/s")
+
+
+def run_engine_benchmark(waiting_calls: int):
+    engine = QueueEngine()
+    call_ids = [uuid.uuid4() for _ in range(waiting_calls)]
+    priorities = [random.choice([0, 0, 0, 1, 2]) for _ in range(waiting_calls)]
+    languages = [random.choice(LANGUAGES) for _ in range(waiting_calls)]
+
+    print(f"Queue engine benchmark with {waiting_calls:,} waiting calls\n")
+
+    def enqueue():
+        for sequence, (call_id, priority, language) in enumerate(zip(call_ids, priorities, languages)):
+            engine.push(call_id, priority, sequence, language)
+
+    def positions():
+        for call_id in random.sample(call_ids, min(1000, waiting_calls)):
+            engine.position(call_id)
+
+    def abandon():
+        for call_id in random.sample(call_ids, waiting_calls // 10):
+            engine.remove(call_id)
+
+    def dequeue():
+        for language in LANGUAGES:
+            while engine.pop(language) is not None:
+                pass
+
+    timed("enqueue", waiting_calls, enqueue)
+    timed("position lookup", min(1000, waiting_calls), positions)
+    timed("abandon (10%)", waiting_calls // 10, abandon)
+    remaining = len(engine)
+    timed("dequeue until empty", remaining, dequeue)
+
+
+def run_dispatch_stress(call_count: int, workers: int):
+    from app.db.session import SessionLocal
+    from app.models.call import Call, CallStatus
+    from app.models.queue import QueueItem
+    from sqlalchemy import update
+
+    from app.models.user import AgentState, User, UserRole
+    from app.services.queue_manager import QueueManager
+
+    run_id = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    agents = [
+        User(
+            email=f"stress-agent-{run_id}-{i}@example.com",
+            name=f"Stress Agent {i}",
+            hashed_password="-",
+            role=UserRole.AGENT,
+            agent_state=AgentState.IDLE,
+            languages=list(LANGUAGES)
+        )
+        for i in range(workers)
+    ]
+    calls = [
+        Call(room_name=f"stress-{run_id}-{i}", language=random.choice(LANGUAGES), status=CallStatus.WAITING)
+        for i in range(call_count)
+    ]
+    db.add_all(agents + calls)
+    db.flush()
+    db.add_all([
+        QueueItem(call_id=call.id, language=call.language, priority=random.choice([0, 0, 1]))
+        for call in calls
+    ])
+    db.commit()
+    agent_ids = [agent.id for agent in agents]
+    call_ids = [call.id for call in calls]
+
+    claims = []
+    claims_lock = threading.Lock()
+
+    def worker(agent_id):
+        session = SessionLocal()
+        manager = QueueManager(session)
+        try:
+            while True:
+                call = manager.claim_next_call(agent_id)
+                if call is None:
+                    return
+                with claims_lock:
+                    claims.append((call.id, agent_id))
+                # Back to IDLE straight away so the agent keeps draining the queue
+                session.execute(
+                    update(User)
+                    .where(User.id == agent_id, User.agent_state == AgentState.RINGING)
+                    .values(agent_state=AgentState.IDLE)
+                    .execution_options(synchronize_session=False)
+                )
+                session.commit()
+        finally:
+            session.close()
+
+    print(f"Dispatch stress test: {call_count:,} calls, {workers} workers\n")
+    threads = [threading.Thread(target=worker, args=(agent_id,)) for agent_id in agent_ids]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    try:
+        claimed = Counter(call_id for call_id, _ in claims)
+        duplicates = [call_id for call_id, count in claimed.items() if count > 1]
+        stored = dict(db.query(Call.id, Call.agent_id).filter(Call.id.in_(call_ids)).all())
+        mismatched = [call_id for call_id, agent_id in claims if stored.get(call_id) != agent_id]
+
+        print(f"claimed {len(claims):,} calls in {elapsed * 1000:.0f} ms ({len(claims) / elapsed:,.0f} claims/s)")
+        print(f"unclaimed: {call_count - len(claimed)}  double-assigned: {len(duplicates)}  mismatched: {len(mismatched)}")
+        if duplicates or mismatched or len(claimed) != call_count:
+            raise SystemExit("FAILED")
+        print("OK")
+    finally:
+        db.query(QueueItem).filter(QueueItem.call_id.in_(call_ids)).delete(synchronize_session=False)
+        db.query(Call).filter(Call.id.in_(call_ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(agent_ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["engine", "dispatch"])
+    parser.add_argument("--calls", type=int)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.mode == "engine":
+        run_engine_benchmark(args.calls or 10_000)
+    else:
+        run_dispatch_stress(args.calls or 2_000, args.workers)
@@ -3,6 +3,7 @@ ALTER TABLE users ADD COLUMN IF NOT EXISTS languages VARCHAR[] DEFAULT NULL;
 ALTER TABLE users ADD COLUMN IF NOT EXISTS is_available BOOLEAN DEFAULT TRUE;
 ALTER TABLE users ADD COLUMN IF NOT EXISTS hourly_rate VARCHAR DEFAULT NULL;
 ALTER TABLE users ADD COLUMN IF NOT EXISTS company_id UUID DEFAULT NULL;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS calendar_feed_token VARCHAR DEFAULT NULL;
 
 -- Create companies table
 CREATE TABLE IF NOT EXISTS companies (
@@ -39,4 +40,141 @@ CREATE INDEX IF NOT EXISTS idx_bookings_employee ON bookings(employee_id);
 CREATE INDEX IF NOT EXISTS idx_bookings_company ON bookings(company_id);
 CREATE INDEX IF NOT EXISTS idx_bookings_start_time ON bookings(start_time);
 CREATE INDEX IF NOT EXISTS idx_users_company ON users(company_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_calendar_feed_token ON users(calendar_feed_token);
 
+
+-- Prevent overlapping active bookings for the same translator.
+-- The GiST index behind the constraint also serves range-overlap conflict lookups.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- The old conflict check let overlapping active bookings through. Stop before adding the
+-- constraint and list every clash, so each one is resolved by hand (cancel or move a booking).
+DO $$
+DECLARE
+    conflicts TEXT;
+    conflict_count INTEGER;
+BEGIN
+    SELECT string_agg(format('%s overlaps %s (translator %s)', b.id, other.id, b.translator_id), E'\n'
+            ORDER BY b.translator_id, b.start_time, b.id),
+        count(*)
+    INTO conflicts, conflict_count
+    FROM bookings b
+    JOIN bookings other
+        ON other.translator_id = b.translator_id
+        AND other.id > b.id
+        AND other.status IN ('PENDING', 'CONFIRMED', 'IN_PROGRESS')
+        AND tsrange(other.start_time, other.start_time + other.duration_minutes * interval '1 minute')
+            && tsrange(b.start_time, b.start_time + b.duration_minutes * interval '1 minute')
+    WHERE b.status IN ('PENDING', 'CONFIRMED', 'IN_PROGRESS');
+
+    IF conflict_count > 0 THEN
+        RAISE EXCEPTION 'Found % overlapping pair(s) of active bookings', conflict_count
+            USING DETAIL = conflicts,
+                HINT = 'Cancel or reschedule one booking of each pair, then run the migration again.';
+    END IF;
+END $$;
+
+DO $$ BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'excl_bookings_translator_period' AND conrelid = 'bookings'::regclass
+    ) THEN
+        ALTER TABLE bookings ADD CONSTRAINT excl_bookings_translator_period
+            EXCLUDE USING gist (
+                translator_id WITH =,
+                tsrange(start_time, start_time + duration_minutes * interval '1 minute') WITH &&
+            ) WHERE (status IN ('PENDING', 'CONFIRMED', 'IN_PROGRESS'));
+    END IF;
+END $$;
+
+-- Keyset pagination order for booking listings
+CREATE INDEX IF NOT EXISTS idx_bookings_start_time_id ON bookings(start_time, id);
+
+-- Bookings still waiting for the lifecycle engine to move them
+CREATE INDEX IF NOT EXISTS idx_bookings_lifecycle_due ON bookings(start_time)
+    WHERE status IN ('CONFIRMED', 'IN_PROGRESS');
+
+-- Language search over translators only, independent of other user counts
+CREATE INDEX IF NOT EXISTS idx_users_translator_languages ON users USING gin (languages)
+    WHERE role = 'TRANSLATOR';
+CREATE INDEX IF NOT EXISTS idx_users_translator_available ON users(is_available)
+    WHERE role = 'TRANSLATOR';
+
+-- Queue order is (priority DESC, enqueue sequence); positions are derived on read
+CREATE SEQUENCE IF NOT EXISTS queue_sequence_seq;
+ALTER TABLE queue ADD COLUMN IF NOT EXISTS sequence BIGINT;
+UPDATE queue SET priority = 0 WHERE priority IS NULL;
+-- Number existing rows in their current queue order, not heap order
+DO $$ BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'queue' AND column_name = 'position'
+    ) THEN
+        EXECUTE $sql$
+            UPDATE queue SET sequence = ordered.rank
+            FROM (
+                SELECT id, row_number() OVER (ORDER BY priority DESC, position, created_at, id) AS rank
+                FROM queue
+            ) ordered
+            WHERE queue.id = ordered.id AND queue.sequence IS NULL
+        $sql$;
+    END IF;
+END $$;
+UPDATE queue SET sequence = nextval('queue_sequence_seq') WHERE sequence IS NULL;
+SELECT setval('queue_sequence_seq', GREATEST(
+    (SELECT COALESCE(MAX(sequence), 0) FROM queue),
+    (SELECT last_value FROM queue_sequence_seq)
+));
+ALTER TABLE queue ALTER COLUMN sequence SET DEFAULT nextval('queue_sequence_seq');
+ALTER TABLE queue ALTER COLUMN sequence SET NOT NULL;
+ALTER TABLE queue DROP COLUMN IF EXISTS position;
+ALTER TABLE queue ALTER COLUMN priority SET NOT NULL;
+-- A call is queued at most once; drop duplicate rows, keeping the earliest enqueue
+DELETE FROM queue duplicate USING queue kept
+WHERE duplicate.call_id = kept.call_id AND (duplicate.sequence, duplicate.id) > (kept.sequence, kept.id);
+DO $$ BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'queue_call_id_key' AND conrelid = 'queue'::regclass
+    ) THEN
+        ALTER TABLE queue ADD CONSTRAINT queue_call_id_key UNIQUE (call_id);
+    END IF;
+END $$;
+CREATE INDEX IF NOT EXISTS idx_queue_order ON queue(priority DESC, sequence);
+
+-- Explicit call center agent occupancy, maintained on call transitions
+DO $$ BEGIN
+    CREATE TYPE agentstate AS ENUM ('IDLE', 'RINGING', 'BUSY', 'OFFLINE');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS agent_state agentstate NOT NULL DEFAULT 'OFFLINE';
+UPDATE users SET agent_state = CASE
+    WHEN EXISTS (
+        SELECT 1 FROM calls WHERE calls.agent_id = users.id AND calls.status = 'RINGING'
+    ) THEN 'RINGING'::agentstate
+    WHEN EXISTS (
+        SELECT 1 FROM calls WHERE calls.agent_id = users.id AND calls.status = 'ACTIVE'
+    ) THEN 'BUSY'::agentstate
+    ELSE 'IDLE'::agentstate
+END
+WHERE role = 'AGENT';
+CREATE INDEX IF NOT EXISTS idx_users_agent_state ON users(agent_state)
+    WHERE role = 'AGENT';
+
+-- Calls carry a required language and are queued in per-language routing pools.
+-- Calls created before this have no language; no agent has the placeholder skill.
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS language VARCHAR;
+UPDATE calls SET language = 'UNSPECIFIED' WHERE language IS NULL;
+ALTER TABLE calls ALTER COLUMN language SET NOT NULL;
+-- Agents without skills served every call before; keep them routed all supported languages
+UPDATE users SET languages = ARRAY['SPANISH', 'FRENCH', 'GERMAN']
+WHERE role = 'AGENT' AND (languages IS NULL OR cardinality(languages) = 0);
+ALTER TABLE queue ADD COLUMN IF NOT EXISTS language VARCHAR;
+UPDATE queue SET language = calls.language FROM calls WHERE calls.id = queue.call_id AND queue.language IS NULL;
+ALTER TABLE queue ALTER COLUMN language SET NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_queue_language_order ON queue(language, priority DESC, sequence);
+
+-- Row versions for optimistic concurrency; updates are conditional on the version read
+ALTER TABLE calls ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE bookings ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime
+
+from app.services.assignment_solver import InterpretationNeed, solve_assignments
+from app.services.translator_index import TranslatorInfo
+
+
+def translator(name, *languages):
+    return TranslatorInfo(
+        id=uuid.uuid4(),
+        email=f"{name.lower()}@example.com",
+        name=name,
+        languages=languages,
+        is_available=True,
+        hourly_rate=None,
+        rate_amount=None
+    )
+
+
+def at(hour, minute=0):
+    return datetime(2026, 1, 5, hour, minute)
+
+
+def test_overlapping_needs_with_different_start_times_are_matched_together():
+    a = translator("A", "SPANISH", "FRENCH")
+    b = translator("B", "SPANISH")
+    needs = [
+        InterpretationNeed(index=0, language="SPANISH", start_time=at(9), end_time=at(10)),
+        InterpretationNeed(index=1, language="FRENCH", start_time=at(9, 30), end_time=at(10, 30)),
+    ]
+
+    assignment = solve_assignments(needs, {"SPANISH": [a, b], "FRENCH": [a]}, {})
+
+    assert {index: info.name for index, info in assignment.items()} == {0: "B", 1: "A"}
+
+
+def test_translator_takes_back_to_back_needs():
+    a = translator("A", "GERMAN")
+    needs = [
+        InterpretationNeed(index=0, language="GERMAN", start_time=at(9), end_time=at(10)),
+        InterpretationNeed(index=1, language="GERMAN", start_time=at(10), end_time=at(11)),
+        InterpretationNeed(index=2, language="GERMAN", start_time=at(10, 30), end_time=at(11)),
+    ]
+
+    assignment = solve_assignments(needs, {"GERMAN": [a]}, {})
+
+    assert {index: info.name for index, info in assignment.items()} == {0: "A", 1: "A"}
+
+
+def test_existing_bookings_block_translators():
+    a = translator("A", "FRENCH")
+    b = translator("B", "FRENCH")
+    needs = [InterpretationNeed(index=0, language="FRENCH", start_time=at(14), end_time=at(15))]
+
+    assignment = solve_assignments(needs, {"FRENCH": [a, b]}, {a.id: [(at(14, 30), at(15, 30))]})
+
+    assert assignment[0].name == "B"
@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from sqlalchemy import event
+
+from app.api.bookings import get_booking, get_bookings
+from app.models.booking import Booking
+from app.models.user import Company, User, UserRole
+from app.schemas.booking import BookingResponse
+
+BOOKING_COUNTS = (1, 10, 50)
+
+
+@contextmanager
+def count_statements(db):
+    """Collect the SQL statements executed on the session's connection"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def create_company_users(db):
+    company = Company(name="Acme", contact_email=f"{uuid.uuid4()}@example.com")
+    db.add(company)
+    db.flush()
+
+    def user(role, name):
+        return User(
+            email=f"{uuid.uuid4()}@example.com",
+            name=name,
+            hashed_password="x",
+            role=role,
+            company_id=company.id if role != UserRole.TRANSLATOR else None,
+        )
+
+    admin = user(UserRole.COMPANY_ADMIN, "Admin")
+    employee = user(UserRole.EMPLOYEE, "Employee")
+    db.add_all([admin, employee])
+    db.flush()
+    return company, admin, employee
+
+
+def add_bookings(db, company, employee, count, offset):
+    """count one-hour bookings with a translator of their own, so names differ per row"""
+    start = datetime(2030, 1, 1, 9) + timedelta(hours=offset)
+    translators = [
+        User(email=f"{uuid.uuid4()}@example.com", name=f"Translator {offset + i}",
+             hashed_password="x", role=UserRole.TRANSLATOR)
+        for i in range(count)
+    ]
+    db.add_all(translators)
+    db.flush()
+    bookings = [
+        Booking(
+            translator_id=translator.id,
+            employee_id=employee.id,
+            company_id=company.id,
+            start_time=start + timedelta(hours=i),
+            duration_minutes=60,
+            language="SPANISH",
+        )
+        for i, translator in enumerate(translators)
+    ]
+    db.add_all(bookings)
+    db.flush()
+    return bookings
+
+
+def list_bookings(db, user):
+    bookings = asyncio.run(get_bookings(
+        response=Response(), start_date=None, end_date=None, limit=None,
+        cursor=None, stream=False, current_user=user, db=db
+    ))
+    return [BookingResponse.model_validate(booking) for booking in bookings]
+
+
+def test_booking_list_statement_count_does_not_grow_with_bookings(db):
+    company, admin, employee = create_company_users(db)
+    admin_id = admin.id
+
+    counts = []
+    total = 0
+    for count in BOOKING_COUNTS:
+        add_bookings(db, company, employee, count - total, total)
+        total = count
+        db.expunge_all()  # Relationships must come from the query, not the identity map
+        user = db.get(User, admin_id)
+
+        with count_statements(db) as statements:
+            responses = list_bookings(db, user)
+
+        assert len(responses) == count
+        assert all(response.translator_name and response.employee_name == "Employee"
+                   and response.company_name == "Acme" for response in responses)
+        counts.append(len(statements))
+
+    assert counts == [1] * len(BOOKING_COUNTS)
+
+
+def test_booking_detail_is_a_single_statement(db):
+    company, admin, employee = create_company_users(db)
+    booking_id = add_bookings(db, company, employee, 1, 0)[0].id
+    admin_id = admin.id
+    db.expunge_all()
+    user = db.get(User, admin_id)
+
+    with count_statements(db) as statements:
+        booking = asyncio.run(get_booking(booking_id=str(booking_id), response=Response(), current_user=user, db=db))
+        response = BookingResponse.model_validate(booking)
+
+    assert response.translator_name == "Translator 0"
+    assert response.employee_name == "Employee"
+    assert response.company_name == "Acme"
+    assert len(statements) == 1
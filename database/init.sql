@@ -3,6 +3,7 @@
 
 -- Create extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS btree_gist;
 
 -- ============================================================================
 -- ENUMS
@@ -27,6 +28,14 @@ CREATE TYPE callstatus AS ENUM (
     'MISSED'
 );
 
+-- Call center agent occupancy
+CREATE TYPE agentstate AS ENUM (
+    'IDLE',
+    'RINGING',
+    'BUSY',
+    'OFFLINE'
+);
+
 -- Booking status enum
 CREATE TYPE bookingstatus AS ENUM (
     'PENDING',
@@ -70,7 +79,13 @@ CREATE TABLE users (
     hourly_rate VARCHAR,
 
     -- Employee-specific fields
-    company_id UUID REFERENCES companies(id) ON DELETE SET NULL
+    company_id UUID REFERENCES companies(id) ON DELETE SET NULL,
+
+    -- Call center agent occupancy, maintained on call transitions
+    agent_state agentstate NOT NULL DEFAULT 'OFFLINE',
+
+    -- Secret token for the subscribable iCalendar booking feed
+    calendar_feed_token VARCHAR
 );
 
 -- Bookings table (translation sessions)
@@ -85,8 +100,15 @@ CREATE TABLE bookings (
     status bookingstatus NOT NULL DEFAULT 'PENDING',
     jitsi_room_name VARCHAR,
     notes TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- A translator can never hold two overlapping active bookings
+    CONSTRAINT excl_bookings_translator_period EXCLUDE USING gist (
+        translator_id WITH =,
+        tsrange(start_time, start_time + duration_minutes * interval '1 minute') WITH &&
+    ) WHERE (status IN ('PENDING', 'CONFIRMED', 'IN_PROGRESS'))
 );
 
 -- Calls table (legacy call center feature)
@@ -95,20 +117,25 @@ CREATE TABLE calls (
     room_name VARCHAR UNIQUE NOT NULL,
     customer_name VARCHAR,
     customer_phone VARCHAR,
+    language VARCHAR NOT NULL,
     agent_id UUID REFERENCES users(id),
     status callstatus NOT NULL DEFAULT 'WAITING',
     start_time TIMESTAMP,
     end_time TIMESTAMP,
     duration INTEGER,
+    version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Queue table (legacy call center feature)
+-- Order is (priority DESC, sequence); positions are derived on read
+CREATE SEQUENCE queue_sequence_seq;
 CREATE TABLE queue (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    call_id UUID NOT NULL REFERENCES calls(id),
-    position INTEGER NOT NULL,
-    priority INTEGER DEFAULT 0,
+    call_id UUID NOT NULL UNIQUE REFERENCES calls(id),
+    language VARCHAR NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    sequence BIGINT NOT NULL DEFAULT nextval('queue_sequence_seq'),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -125,12 +152,30 @@ CREATE TABLE translator_languages (
 -- User indexes
 CREATE UNIQUE INDEX ix_users_email ON users(email);
 CREATE INDEX idx_users_company ON users(company_id);
+CREATE UNIQUE INDEX ix_users_calendar_feed_token ON users(calendar_feed_token);
+
+-- Language search over translators only, independent of other user counts
+CREATE INDEX idx_users_translator_languages ON users USING gin (languages)
+    WHERE role = 'TRANSLATOR';
+CREATE INDEX idx_users_translator_available ON users(is_available)
+    WHERE role = 'TRANSLATOR';
+
+-- Agent occupancy lookups
+CREATE INDEX idx_users_agent_state ON users(agent_state)
+    WHERE role = 'AGENT';
 
 -- Booking indexes for better query performance
 CREATE INDEX idx_bookings_translator ON bookings(translator_id);
 CREATE INDEX idx_bookings_employee ON bookings(employee_id);
 CREATE INDEX idx_bookings_company ON bookings(company_id);
 CREATE INDEX idx_bookings_start_time ON bookings(start_time);
+CREATE INDEX idx_bookings_start_time_id ON bookings(start_time, id);
+CREATE INDEX idx_bookings_lifecycle_due ON bookings(start_time)
+    WHERE status IN ('CONFIRMED', 'IN_PROGRESS');
+
+-- Queue dequeue order
+CREATE INDEX idx_queue_order ON queue(priority DESC, sequence);
+CREATE INDEX idx_queue_language_order ON queue(language, priority DESC, sequence);
 
 -- ============================================================================
 -- SAMPLE DATA
@@ -140,11 +185,12 @@ CREATE INDEX idx_bookings_start_time ON bookings(start_time);
 -- Password for all users: 'password123'
 -- Hash: $2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge
 
-INSERT INTO users (id, email, name, hashed_password, role) VALUES
-    (uuid_generate_v4(), 'admin@example.com', 'Admin', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'ADMIN'),
-    (uuid_generate_v4(), 'agent1@example.com', 'Agent One', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'AGENT'),
-    (uuid_generate_v4(), 'agent2@example.com', 'Agent Two', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'AGENT'),
-    (uuid_generate_v4(), 'supervisor@example.com', 'Supervisor', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'SUPERVISOR');
+-- Agents are routed the calls of their languages
+INSERT INTO users (id, email, name, hashed_password, role, languages) VALUES
+    (uuid_generate_v4(), 'admin@example.com', 'Admin', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'ADMIN', NULL),
+    (uuid_generate_v4(), 'agent1@example.com', 'Agent One', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'AGENT', ARRAY['SPANISH', 'FRENCH']),
+    (uuid_generate_v4(), 'agent2@example.com', 'Agent Two', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'AGENT', ARRAY['GERMAN', 'SPANISH']),
+    (uuid_generate_v4(), 'supervisor@example.com', 'Supervisor', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5QK9hF.y8kqge', 'SUPERVISOR', NULL);
 
 -- ============================================================================
 -- USER REGISTRATION
@@ -90,4 +90,4 @@ class WebSocketClient {
 }
 
 const WS_URL = process.env.NEXT_PUBLIC_API_URL?.replace('http', 'ws') || 'ws://localhost:8000';
-export const wsClient = new WebSocketClient(`${WS_URL}/ws`);
+export const wsClient = new WebSocketClient(`${WS_URL}/queue/ws`);